@@ -4,64 +4,35 @@ import time
 import datetime
 import traceback
 import io
+import argparse
+import functools
+import collections
 import cv2
 import numpy as np
-from PIL import Image
 from PySide6 import QtCore, QtWidgets, QtGui
 
+from ascii_core import (
+    CHAR_SETS, DEFAULTS, DITHER_MODES, save_dir, glyph_codes,
+    ASCIIRenderer, BufferPool, FrameHistory, MotionGate, SUBCELLS, fit_grid,
+    cell_colors, frame_colors, ansi_text, rasterize,
+    PNGStreamWriter, write_svg, write_html, write_html_animation,
+)
+
 try:
     from fpdf import FPDF
 except ImportError:
     FPDF = None
 
 # ══════════════════════════════════════════════════════════════
-CHAR_SETS = {
-    "Detailed": " .'`^\",:;Il!i><~+_-?][}{1)(|\\/tfjrxnuvczXYUJCLQ0OZmwqpdbkhao*#MW&8%B@$",
-    "Newspaper": "@#%+=-:. ",
-    "Block": "█▒░ ",
-    "Dot": ".",
-    "LightSmooth": " _.,:;i1tfLCG08@",  # ← НОВЫЙ: 16 символов, равномерная плотность
-}
-
-# ✅ ИСПРАВЛЕНО: ключи теперь ЕДИНООБРАЗНЫ — 'ascii_w', 'ascii_h', 'char_set_name'
-DEFAULTS = {
-    'ascii_w': 80,          # ← было 'width'
-    'ascii_h': 44,          # ← было 'height'
-    'contrast': 1.3,
-    'font_size': 10,
-    'use_color': True,
-    'invert': False,
-    'auto_contrast': True,
-    'char_set_name': "LightSmooth",
-    'lock_aspect': True,
-}
-
 CAMERA_WIDTH, CAMERA_HEIGHT = 640, 480
 
-# ✅ Рабочий путь для Pydroid 3 и кросс-платформенный fallback
-if sys.platform == "win32":
-    SAVE_DIR = os.path.expanduser("~/ASCII_Camera/")
-elif sys.platform == "linux" and "ANDROID_ROOT" in os.environ:
-    candidates = [
-        "/storage/emulated/0/Download/ASCII_Camera/",
-        "/sdcard/Download/ASCII_Camera/",
-        os.path.expanduser("~/ASCII_Camera/"),
-    ]
-    for cand in candidates:
-        try:
-            os.makedirs(cand, exist_ok=True)
-            with open(os.path.join(cand, ".test_write"), "w") as f:
-                f.write("ok")
-            os.remove(os.path.join(cand, ".test_write"))
-            SAVE_DIR = cand
-            break
-        except (OSError, PermissionError, IOError):
-            continue
-    else:
-        SAVE_DIR = os.path.expanduser("~/ASCII_Camera/")
-else:
-    SAVE_DIR = os.path.expanduser("~/ASCII_Camera/")
-# ===============================================================
+POWER_LABELS = {
+    "active": "⚡ live",
+    "throttled": "🐢 unfocused",
+    "paused": "⏸ paused",
+    "resuming": "⏳ camera…",
+    "released": "💤 camera off",
+}
 
 
 class ThemeManager(QtCore.QObject):
@@ -341,40 +312,321 @@ class ThemeManager(QtCore.QObject):
 # ───────────────────────────────────────────────────────────────
 
 
-class ASCIIRenderer:
-    def __init__(self):
-        self.chars = None
-        self.n = 0
-        self.mode = "normal"
-
-    def set_chars(self, char_string):
-        if char_string == ".":
-            self.mode = "dot"
-            self.chars = np.array(['.'])
-            self.n = 1
-        else:
-            self.mode = "normal"
-            self.chars = np.array(list(char_string))
-            self.n = len(self.chars)
-
-    def render(self, frame_rgb, out_w, out_h, contrast=1.0, auto_contrast=False):
-        pil_img = Image.fromarray(frame_rgb)
-        resized = pil_img.resize((out_w, out_h), Image.Resampling.LANCZOS)
-        img = np.array(resized)
-        gray = 0.299 * img[:, :, 0] + 0.587 * img[:, :, 1] + 0.114 * img[:, :, 2]
-        if auto_contrast and gray.size > 0:
-            g_min, g_max = gray.min(), gray.max()
-            if g_max > g_min:
-                gray = 255 * (gray - g_min) / (g_max - g_min)
-        else:
-            gray = np.clip(128 + (gray - 128) * contrast, 0, 255)
-        if self.mode == "dot":
-            symbols = np.full(gray.shape, '.', dtype='<U1')
-            return symbols, img.astype(np.uint8), gray.astype(np.uint8)
-        else:
-            indices = np.clip((gray / 255.0) * (self.n - 1), 0, self.n - 1).astype(int)
-            symbols = self.chars[indices]
-            return symbols, img.astype(np.uint8), gray.astype(np.uint8)
+class RegionOfInterest:
+    # Центр и кратность зума в долях кадра: окно всегда сохраняет пропорции камеры
+    def __init__(self, max_zoom=DEFAULTS['max_zoom']):
+        self.max_zoom = max_zoom
+        self.follow = False
+        self.follow_rate = DEFAULTS['roi_follow_rate']
+        self.motion_threshold = DEFAULTS['roi_motion_threshold']
+        self._prev_thumb = None
+        self.reset()
+
+    def set_follow(self, enabled):
+        self.follow = enabled
+        self._prev_thumb = None
+
+    def reset(self):
+        self.cx = 0.5
+        self.cy = 0.5
+        self.zoom = 1.0
+
+    @property
+    def is_full(self):
+        return self.zoom <= 1.0 + 1e-6
+
+    def _clamp(self):
+        self.zoom = min(self.max_zoom, max(1.0, self.zoom))
+        half = 0.5 / self.zoom
+        self.cx = min(1.0 - half, max(half, self.cx))
+        self.cy = min(1.0 - half, max(half, self.cy))
+
+    def rect(self):
+        half = 0.5 / self.zoom
+        return self.cx - half, self.cy - half, 2 * half, 2 * half
+
+    def set_rect(self, x, y, w, h):
+        self.cx = x + w / 2.0
+        self.cy = y + h / 2.0
+        self.zoom = 1.0 / max(w, h, 1e-6)
+        self._clamp()
+
+    def zoom_by(self, factor, cx=None, cy=None):
+        # Точка (cx, cy) остаётся на месте на экране — как зум колесом в просмотрщиках
+        x, y, w, h = self.rect()
+        px = self.cx if cx is None else cx
+        py = self.cy if cy is None else cy
+        fx, fy = (px - x) / w, (py - y) / h
+        self.zoom *= factor
+        self._clamp()
+        half = 0.5 / self.zoom
+        self.cx = px - (fx - 0.5) * 2 * half
+        self.cy = py - (fy - 0.5) * 2 * half
+        self._clamp()
+
+    def pan(self, dx, dy):
+        # Сдвиг в долях текущего окна
+        self.cx += dx / self.zoom
+        self.cy += dy / self.zoom
+        self._clamp()
+
+    def map_from_view(self, nx, ny):
+        x, y, w, h = self.rect()
+        return x + nx * w, y + ny * h
+
+    def crop(self, frame):
+        if self.is_full:
+            return frame
+        H, W = frame.shape[:2]
+        x, y, w, h = self.rect()
+        x0, y0 = int(round(x * W)), int(round(y * H))
+        x1 = max(x0 + 1, int(round((x + w) * W)))
+        y1 = max(y0 + 1, int(round((y + h) * H)))
+        return frame[y0:y1, x0:x1]
+
+    def follow_motion(self, thumb):
+        # thumb — миниатюра полного кадра (MotionGate.thumbnail); маска движения между соседними кадрами
+        prev, self._prev_thumb = self._prev_thumb, thumb
+        if prev is None or prev.shape != thumb.shape:
+            return False
+        mask = (np.abs(thumb - prev) > self.motion_threshold).astype(np.uint8)
+        if not mask.any():
+            return False
+        n, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+        if n < 2:
+            return False
+        best = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+        bx, by, bw, bh, _ = stats[best].tolist()
+        th, tw = thumb.shape
+        # Цель — рамка вокруг движения с полями, зум ограничен снизу размером объекта
+        target_zoom = min(self.max_zoom, 1.0 / max(1.5 * bw / tw, 1.5 * bh / th, 1.0 / self.max_zoom))
+        tx, ty = (bx + bw / 2.0) / tw, (by + bh / 2.0) / th
+        r = self.follow_rate
+        self.cx += r * (tx - self.cx)
+        self.cy += r * (ty - self.cy)
+        self.zoom += r * (target_zoom - self.zoom)
+        self._clamp()
+        return True
+
+# ───────────────────────────────────────────────────────────────
+
+
+def paint_halfblocks(painter, rgb, bg_rgb, char_w, line_h):
+    # Полублоки — это просто картинка W×2H: одна drawImage вместо W×H вызовов drawText
+    H, W = rgb.shape[:2]
+    pixels = np.empty((2 * H, W, 3), dtype=np.uint8)
+    pixels[0::2] = rgb
+    pixels[1::2] = bg_rgb
+    img = QtGui.QImage(pixels.data, W, 2 * H, W * 3, QtGui.QImage.Format_RGB888)
+    painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform, False)
+    painter.drawImage(QtCore.QRectF(0, 0, W * char_w, H * line_h), img)
+
+
+class StaticTextCache:
+    # LRU готовых раскладок QStaticText: ключ — шрифт и текст строки одного уровня серого.
+    # Неизменившиеся строки следующего кадра берут раскладку из кэша.
+    def __init__(self, capacity=1024):
+        self._items = collections.OrderedDict()
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.draw_calls = 0     # за последний вызов paint_ascii
+
+    def fit(self, capacity):
+        self.capacity = max(self.capacity, capacity)
+
+    def get(self, font, text):
+        key = (font.key(), text)
+        item = self._items.get(key)
+        if item is not None:
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item
+        self.misses += 1
+        item = QtGui.QStaticText(text)
+        item.setTextFormat(QtCore.Qt.PlainText)
+        item.setPerformanceHint(QtGui.QStaticText.AggressiveCaching)
+        self._items[key] = item
+        while len(self._items) > self.capacity:
+            self._items.popitem(last=False)
+        return item
+
+
+STATIC_TEXT = StaticTextCache()
+
+
+@functools.lru_cache(maxsize=32)
+def run_font(font_size, chars, char_w):
+    # Шрифт для прогонов: межбуквенный интервал подогнан так, чтобы шаг был ровно char_w.
+    # None — если у какого-то глифа (например, из запасного шрифта) другая ширина и колонки поплывут.
+    font = QtGui.QFont("Courier New", font_size)
+    font.setLetterSpacing(QtGui.QFont.AbsoluteSpacing,
+                          char_w - QtGui.QFontMetricsF(font).horizontalAdvance("W"))
+    fm = QtGui.QFontMetricsF(font)
+    if all(abs(fm.horizontalAdvance(ch) - char_w) < 0.01 for ch in set(chars + " ")):
+        return font
+    return None
+
+
+def paint_mono_runs(painter, frame, rgb, font, font_size, line_h, levels):
+    # Монохром: серый квантуется до levels уровней, каждая строка — по одному QStaticText на уровень,
+    # где клетки других уровней заменены пробелами. Вызовов отрисовки ~H×levels вместо W×H.
+    H, W = frame.shape
+    codes = glyph_codes(frame.chars)
+    space = ord(" ")
+    level = (rgb[..., 0].astype(np.uint16) * (levels - 1) + 127) // 255
+    glyphs = np.take(codes, frame.indices)
+    level[glyphs == space] = levels     # пробелы ничего не рисуют — вне уровней
+    encoding = "ascii" if codes.dtype == np.uint8 else "utf-32-le"
+    ascent = QtGui.QFontMetricsF(font).ascent()
+    # Базовая линия строки снапается к целому пикселю устройства (+¼ — вдали от границы округления).
+    # Иначе на полуцелых позициях шум плавающей точки сдвигает строку на пиксель по-разному
+    # в разных полосах постера, и тайлы перестают совпадать с цельной картинкой.
+    transform = painter.transform()
+    m22, dy = transform.m22(), transform.dy()
+    STATIC_TEXT.fit(2 * H * levels)
+    calls = 0
+    buf = np.empty(W, dtype=codes.dtype)
+    for y in range(H):
+        row_levels = level[y]
+        device = np.floor(m22 * (y * line_h + font_size) + dy + 0.5 + 1e-6) + 0.25
+        top = (device - dy) / m22 - ascent
+        for lv in np.unique(row_levels).tolist():
+            if lv == levels:
+                continue
+            np.copyto(buf, glyphs[y])
+            buf[row_levels != lv] = space
+            text = STATIC_TEXT.get(font, buf.tobytes().decode(encoding))
+            v = lv * 255 // (levels - 1)
+            painter.setPen(QtGui.QColor(v, v, v))
+            painter.drawStaticText(QtCore.QPointF(0, top), text)
+            calls += 1
+    return calls
+
+
+def paint_ascii(painter, frame, rgb, font_size, char_w, line_h, bg_rgb=None, mono=False):
+    if bg_rgb is not None:
+        paint_halfblocks(painter, rgb, bg_rgb, char_w, line_h)
+        STATIC_TEXT.draw_calls = 1
+        return
+    painter.setRenderHint(QtGui.QPainter.TextAntialiasing, False)
+    font = run_font(int(font_size), frame.chars, char_w) if mono else None
+    if font is not None:
+        painter.setFont(font)
+        STATIC_TEXT.draw_calls = paint_mono_runs(painter, frame, rgb, font, font_size, line_h,
+                                                 DEFAULTS['mono_levels'])
+        return
+    font = QtGui.QFont("Courier New", int(font_size))
+    painter.setFont(font)
+    H, W = frame.shape
+    rows = frame.rows()
+    for y in range(H):
+        row_symbols = rows[y]
+        row_rgb = rgb[y].tolist()
+        baseline = y * line_h + font_size
+        for x in range(W):
+            r, g, b = row_rgb[x]
+            painter.setPen(QtGui.QColor(r, g, b))
+            painter.drawText(QtCore.QPointF(x * char_w, baseline), row_symbols[x])
+    STATIC_TEXT.draw_calls = H * W
+
+
+class RasterWorker(QtCore.QThread):
+    frame_ready = QtCore.Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._mutex = QtCore.QMutex()
+        self._wake = QtCore.QWaitCondition()
+        self._job = None
+        self._running = True
+        self._front = None
+        self._back = None
+        self._front_pixels = None   # numpy-буферы, на которые смотрят QImage
+        self._back_pixels = None
+        self._staged = None         # копия кадра для ожидающей задачи
+        self._working = None        # кадр, который растеризуется сейчас
+        self.pool = BufferPool()
+        self._serial = 0
+        self.frames_rasterized = 0
+
+    def submit(self, job):
+        # Only the latest job matters: a pending one is replaced, never queued.
+        # The frame is copied into a thread-owned buffer: the renderer reuses its own.
+        self._mutex.lock()
+        self._staged = job['frame'].copy_to(self._staged)
+        job['frame'] = self._staged
+        self._job = job
+        self._wake.wakeOne()
+        self._mutex.unlock()
+
+    def stop(self):
+        self._mutex.lock()
+        self._running = False
+        self._wake.wakeOne()
+        self._mutex.unlock()
+        self.wait()
+
+    def draw_front(self, painter):
+        self._mutex.lock()
+        try:
+            if self._front is not None:
+                painter.drawImage(0, 0, self._front)
+            return self._serial
+        finally:
+            self._mutex.unlock()
+
+    def run(self):
+        while True:
+            self._mutex.lock()
+            while self._job is None and self._running:
+                self._wake.wait(self._mutex)
+            job, self._job = self._job, None
+            if job is not None:
+                self._working, self._staged = self._staged, self._working
+            running = self._running
+            self._mutex.unlock()
+            if not running:
+                break
+            try:
+                self._rasterize(job)
+            except Exception as e:
+                print("Raster error:", e)
+                continue
+            self._mutex.lock()
+            self._front, self._back = self._back, self._front
+            self._front_pixels, self._back_pixels = self._back_pixels, self._front_pixels
+            self._serial += 1
+            self.frames_rasterized += 1
+            self._mutex.unlock()
+            self.frame_ready.emit()
+
+    def _rasterize(self, job):
+        # Растеризация в ядре (NumPy, без Qt); QImage только оборачивает готовый буфер
+        # Буферы и их QImage пересоздаются только при смене размера картинки
+        frame = job['frame']
+        params = job['params']
+        H, W = frame.shape
+        shape = (H * int(job['line_h']), W * int(job['char_w']), 3)
+        if self._back_pixels is None or self._back_pixels.shape != shape:
+            self._back_pixels = np.empty(shape, dtype=np.uint8)
+            self._back = QtGui.QImage(self._back_pixels.data, shape[1], shape[0], shape[1] * 3,
+                                      QtGui.QImage.Format_RGB888)
+            self.pool.allocations += 1
+        rgb, bg_rgb = frame_colors(frame, params, self.pool)
+        bg = (255, 255, 255) if params['invert'] else (0, 0, 0)
+        rasterize(frame, rgb, bg, params['font_size'], job['char_w'], job['line_h'], bg_rgb,
+                  out=self._back_pixels, pool=self.pool)
+
+# ───────────────────────────────────────────────────────────────
+
+
+def qimage_rows(img):
+    # RGB888 строки выровнены по 4 байта — срезаем хвост, не копируя
+    bits = img.constBits()
+    arr = np.frombuffer(bits, dtype=np.uint8, count=img.sizeInBytes())
+    arr = arr.reshape(img.height(), img.bytesPerLine())
+    return arr[:, :img.width() * 3].reshape(img.height(), img.width(), 3)
 
 # ───────────────────────────────────────────────────────────────
 
@@ -382,27 +634,103 @@ class ASCIIRenderer:
 class ASCIICameraWidget(QtWidgets.QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.renderer = ASCIIRenderer()
+        self.renderer = ASCIIRenderer(reuse_buffers=True)
         # ✅ ИСПРАВЛЕНО: используем 'char_set_name' из DEFAULTS
         self.renderer.set_chars(CHAR_SETS[DEFAULTS['char_set_name']])
         # ✅ ИСПРАВЛЕНО: копируем DEFAULTS с правильными ключами
         self.params = {k: v for k, v in DEFAULTS.items()}
         self.char_w = 8
         self.line_h = 14
-        self.ascii_symbols = None
-        self.colors = None
-        self.gray = None
+        self.frame = None
+        self.last_frame_bgr = None     # ROI показанного живого кадра — для постера в полном разрешении
+        self._capture_buf = None
+        self.buffers = BufferPool()
+        self.history = FrameHistory()
+        self.frozen = False
+        self.history_pos = 0
+        self.motion_gate = MotionGate()
+        self.roi = RegionOfInterest()
+        self.setFocusPolicy(QtCore.Qt.StrongFocus)    # щелчок по картинке возвращает ей пробел и стрелки
+        self._drag_origin = None
+        self._rubber_band = QtWidgets.QRubberBand(QtWidgets.QRubberBand.Rectangle, self)
+        self.set_temporal_smoothing(DEFAULTS['temporal_smoothing'])
         self.last_frame_time = time.time()
         self.fps = 0.0
+        self.frames_displayed = 0
+        self._displayed_serial = 0
+        self.raster = RasterWorker(self)
+        self.raster.frame_ready.connect(self.update)
+        self.raster.start()
+        self.cap = None
+        self.open_camera()
+        self.power_state = "active"
+        self._app_visible = True
+        self._app_focused = True
+        self.idle_timer = QtCore.QTimer()
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.timeout.connect(self.release_camera)
+        self.timer = QtCore.QTimer()
+        self.timer.timeout.connect(self.update_frame)
+        self.timer.start(DEFAULTS['frame_interval_ms'])
+        self.fit_timer = QtCore.QTimer()
+        self.fit_timer.setSingleShot(True)
+        self.fit_timer.timeout.connect(self.fit_grid)
+        self.update_metrics()
+
+    def open_camera(self):
+        if self.cap is not None:
+            return
         self.cap = cv2.VideoCapture(0)
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
         self.cap.set(cv2.CAP_PROP_AUTOFOCUS, 1)
         self.cap.set(cv2.CAP_PROP_AUTO_EXPOSURE, 0.25)
-        self.timer = QtCore.QTimer()
-        self.timer.timeout.connect(self.update_frame)
-        self.timer.start(40)
-        self.update_metrics()
+        self.motion_gate.invalidate()
+        self.last_frame_time = time.time()
+
+    def release_camera(self):
+        if self.cap is None:
+            return
+        self.cap.release()
+        self.cap = None
+        self.power_state = "released"
+
+    def set_power_hints(self, visible=None, focused=None):
+        if visible is not None:
+            self._app_visible = visible
+        if focused is not None:
+            self._app_focused = focused
+        self._apply_power_policy()
+
+    def _apply_power_policy(self):
+        # 🔋 Скрыто/свёрнуто/заморожено — захват стоит, камера отпускается по таймауту;
+        # без фокуса — реже; иначе полная частота
+        if not self._app_visible or self.frozen:
+            self.timer.stop()
+            if self.cap is not None:
+                if not self.idle_timer.isActive():
+                    self.idle_timer.start(int(self.params['camera_idle_s'] * 1000))
+                self.power_state = "paused"
+            return
+        self.idle_timer.stop()
+        if self.cap is None:
+            # Открытие камеры медленное — сначала даём окну отрисовать последний кадр
+            self.power_state = "resuming"
+            QtCore.QTimer.singleShot(0, self._resume_capture)
+            return
+        self._resume_capture()
+
+    def _resume_capture(self):
+        if not self._app_visible or self.frozen:
+            return
+        self.open_camera()
+        focused = self._app_focused
+        interval = DEFAULTS['frame_interval_ms'] if focused else DEFAULTS['unfocused_interval_ms']
+        if not self.timer.isActive() or self.timer.interval() != interval:
+            if not self.timer.isActive():
+                self.last_frame_time = time.time()
+            self.timer.start(interval)
+        self.power_state = "active" if focused else "throttled"
 
     def update_params(self,
                       ascii_w=None, ascii_h=None, contrast=None,
@@ -441,8 +769,8 @@ class ASCIICameraWidget(QtWidgets.QWidget):
             self.params['lock_aspect'] = lock_aspect
             changed = True
 
-        # 🔑 АВТОМАТИЧЕСКАЯ КОРРЕКЦИЯ ВЫСОТЫ ПРИ LOCK
-        if self.params['lock_aspect'] and changed:
+        # 🔑 АВТОМАТИЧЕСКАЯ КОРРЕКЦИЯ ВЫСОТЫ ПРИ LOCK (при подгонке под окно пропорции задаёт источник)
+        if self.params['lock_aspect'] and not self.params['fit_to_widget'] and changed:
             ideal_h = int(self.params['ascii_w'] * 0.55)
             ideal_h = max(10, min(70, ideal_h))
             if self.params['ascii_h'] != ideal_h:
@@ -451,9 +779,10 @@ class ASCIICameraWidget(QtWidgets.QWidget):
                     self._notify_height_change(ideal_h)
 
         if changed:
+            self.motion_gate.invalidate()
             self.update_metrics()
-        if redraw_needed:
-            self.update()
+        elif redraw_needed:
+            self._submit_raster()
 
     def set_notify_height_callback(self, callback):
         self._notify_height_change = callback
@@ -466,108 +795,228 @@ class ASCIICameraWidget(QtWidgets.QWidget):
         fm = QtGui.QFontMetrics(font)
         self.char_w = fm.horizontalAdvance("W") or 8
         self.line_h = fm.height() + 2
-        self.update()
+        self._submit_raster()
+        if self.params['fit_to_widget']:
+            self.fit_timer.start(DEFAULTS['fit_debounce_ms'])
+
+    def set_fit_to_widget(self, enabled):
+        self.params['fit_to_widget'] = enabled
+        if enabled:
+            self.fit_grid()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.params['fit_to_widget']:
+            # Пересчёт после паузы: при перетаскивании края окна сетка не меняется на каждый пиксель
+            self.fit_timer.start(DEFAULTS['fit_debounce_ms'])
+
+    def source_aspect(self):
+        # ROI всегда сохраняет пропорции камеры, так что достаточно размера кадра захвата
+        if self._capture_buf is not None:
+            h, w = self._capture_buf.shape[:2]
+            return w / h
+        return CAMERA_WIDTH / CAMERA_HEIGHT
+
+    def fit_grid(self):
+        if not self.params['fit_to_widget']:
+            return
+        w, h = fit_grid(self.width(), self.height(), self.char_w, self.line_h, self.source_aspect())
+        if (w, h) == (self.params['ascii_w'], self.params['ascii_h']):
+            return
+        # Буферы рендера/растра пересоздаются только здесь — когда сетка действительно изменилась
+        self.update_params(ascii_w=w, ascii_h=h)
+        if hasattr(self, '_notify_width_change'):
+            self._notify_width_change(w)
+        if hasattr(self, '_notify_height_change'):
+            self._notify_height_change(h)
 
     def update_frame(self):
-        ret, frame = self.cap.read()
+        if self.frozen or self.cap is None:
+            return
+        # Кадр читается в тот же буфер, что и в прошлый раз (OpenCV пишет в image=, если форма совпала)
+        ret, frame = self.cap.read(self._capture_buf)
         if not ret:
             return
+        self._capture_buf = frame
         now = time.time()
         self.fps = 0.9 * self.fps + 0.1 * (1.0 / max(0.001, now - self.last_frame_time))
         self.last_frame_time = now
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        if self.roi.follow:
+            self.roi.follow_motion(self.motion_gate.thumbnail(frame))
+        # ROI — срез без копирования; cvtColor и ресайз работают только по нему
+        view = self.roi.crop(frame)
+        if not self.motion_gate.should_render(view, now, self.renderer.settling):
+            return
+        # Копия в буфер пула: буфер захвата перезаписывают и кадры, которые гейт пропустил
+        self.last_frame_bgr = self.buffers.get('source_bgr', view.shape)
+        np.copyto(self.last_frame_bgr, view)
+        # Сначала уменьшение до сетки (INTER_AREA), потом BGR→RGB — уже по тысячам пикселей;
+        # оба шага пишут в буферы пула, которые меняются только вместе с размером сетки
+        sy, sx = SUBCELLS.get(self.renderer.mode, (1, 1))
+        grid_h, grid_w = self.params['ascii_h'] * sy, self.params['ascii_w'] * sx
+        small = self.buffers.get('small_bgr', (grid_h, grid_w, 3))
+        cv2.resize(view, (grid_w, grid_h), dst=small, interpolation=cv2.INTER_AREA)
+        frame_rgb = self.buffers.get('small_rgb', (grid_h, grid_w, 3))
+        cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=frame_rgb)
         try:
-            symbols, colors, gray = self.renderer.render(
+            self.frame = self.renderer.render(
                 frame_rgb,
                 self.params['ascii_w'],
                 self.params['ascii_h'],
                 self.params['contrast'],
                 self.params['auto_contrast']
             )
-            self.ascii_symbols = symbols
-            self.colors = colors
-            self.gray = gray
         except Exception as e:
             print("Render error:", e)
-        self.update()
+            return
+        self.history.append(self.frame, now)
+        self._submit_raster()
+
+    def set_roi(self, x, y, w, h):
+        self.roi.set_rect(x, y, w, h)
+        self.motion_gate.invalidate()
+
+    def reset_roi(self):
+        self.roi.reset()
+        self.motion_gate.invalidate()
+
+    def zoom_roi(self, factor, cx=None, cy=None):
+        self.roi.zoom_by(factor, cx, cy)
+        self.motion_gate.invalidate()
+
+    def pan_roi(self, dx, dy):
+        self.roi.pan(dx, dy)
+        self.motion_gate.invalidate()
+
+    def set_roi_follow(self, enabled):
+        self.roi.set_follow(enabled)
+        if not enabled:
+            self.motion_gate.invalidate()
+
+    def _view_point(self, pos):
+        # Координаты виджета → доли текущего кадра (с учётом уже действующего ROI)
+        H, W = self.params['ascii_h'], self.params['ascii_w']
+        nx = min(1.0, max(0.0, pos.x() / max(1, W * self.char_w)))
+        ny = min(1.0, max(0.0, pos.y() / max(1, H * self.line_h)))
+        return self.roi.map_from_view(nx, ny)
+
+    def mousePressEvent(self, event):
+        if event.button() == QtCore.Qt.LeftButton:
+            self._drag_origin = event.position().toPoint()
+            self._rubber_band.setGeometry(QtCore.QRect(self._drag_origin, QtCore.QSize()))
+            self._rubber_band.show()
+        elif event.button() == QtCore.Qt.RightButton:
+            self.reset_roi()
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self._drag_origin is not None:
+            self._rubber_band.setGeometry(
+                QtCore.QRect(self._drag_origin, event.position().toPoint()).normalized()
+            )
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == QtCore.Qt.LeftButton and self._drag_origin is not None:
+            rect = QtCore.QRect(self._drag_origin, event.position().toPoint()).normalized()
+            self._rubber_band.hide()
+            self._drag_origin = None
+            if rect.width() > 8 and rect.height() > 8:
+                x0, y0 = self._view_point(rect.topLeft())
+                x1, y1 = self._view_point(rect.bottomRight())
+                self.set_roi(x0, y0, x1 - x0, y1 - y0)
+        super().mouseReleaseEvent(event)
+
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() / 120.0
+        if steps:
+            cx, cy = self._view_point(event.position().toPoint())
+            self.zoom_roi(1.25 ** steps, cx, cy)
+        event.accept()
+
+    def set_temporal_smoothing(self, enabled):
+        if enabled:
+            self.renderer.set_temporal(DEFAULTS['temporal_alpha'], DEFAULTS['hysteresis'])
+        else:
+            self.renderer.set_temporal(0.0, 0.0)
 
-    def paintEvent(self, event):
-        if self.ascii_symbols is None:
+    def set_dither(self, mode):
+        self.renderer.set_dither(mode)
+        self.motion_gate.invalidate()
+
+    def set_motion_gate(self, enabled):
+        self.motion_gate.enabled = enabled
+        self.motion_gate.invalidate()
+
+    def set_frozen(self, frozen):
+        if self.frozen == frozen:
             return
+        self.frozen = frozen
+        self.history_pos = 0
+        self.motion_gate.invalidate()
+        if not frozen and len(self.history):
+            self.frame = self.history.get(0).copy()
+        self._apply_power_policy()
+
+    def seek_history(self, back):
+        if not self.frozen or not len(self.history):
+            return self.history_pos
+        back = max(0, min(len(self.history) - 1, back))
+        self.history_pos = back
+        # копия, чтобы растеризатор не читал слот, который перезапишется после разморозки
+        self.frame = self.history.get(back).copy()
+        self._submit_raster()
+        return back
+
+    def save_history_range(self, first, last, fmt="png", scale=2):
+        if not len(self.history):
+            return 0, []
+        first = max(0, min(len(self.history) - 1, first))
+        last = max(0, min(len(self.history) - 1, last))
+        oldest, newest = max(first, last), min(first, last)
+        saved = []
+        for back in range(oldest, newest - 1, -1):
+            frame = self.history.get(back)
+            stamp = datetime.datetime.fromtimestamp(self.history.timestamp(back))
+            suffix = stamp.strftime("_%H%M%S_%f")[:-3]
+            if fmt == "txt":
+                success, path = self.save_current_frame_txt(frame=frame, suffix=suffix)
+            elif fmt in ("svg", "html"):
+                success, path = self.save_vector(fmt=fmt, frame=frame, suffix=suffix)
+            else:
+                success, path = self.save_frame(fmt=fmt, scale=scale, frame=frame, suffix=suffix)
+            if success:
+                saved.append(path)
+        return len(saved), saved
+
+    def paintEvent(self, event):
         painter = QtGui.QPainter(self)
-        font = QtGui.QFont("Courier New", self.params['font_size'])
-        painter.setFont(font)
-        painter.setRenderHint(QtGui.QPainter.TextAntialiasing, False)
         bg = QtCore.Qt.white if self.params['invert'] else QtCore.Qt.black
         painter.fillRect(self.rect(), bg)
-        H, W = self.ascii_symbols.shape
-        for y in range(H):
-            for x in range(W):
-                ch = self.ascii_symbols[y, x]
-                if self.params['use_color']:
-                    color_arr = self.colors[y, x]
-                else:
-                    val = int(self.gray[y, x])
-                    color_arr = (val, val, val)
-                r, g, b = color_arr
-                if self.params['char_set_name'] == "Dot":
-                    brightness = self.gray[y, x] / 255.0
-                    if self.params['invert']:
-                        r = int(r * (1 - brightness) + 255 * brightness)
-                        g = int(g * (1 - brightness) + 255 * brightness)
-                        b = int(b * (1 - brightness) + 255 * brightness)
-                    else:
-                        r = int(r * brightness)
-                        g = int(g * brightness)
-                        b = int(b * brightness)
-                if self.params['invert']:
-                    r, g, b = 255 - r, 255 - g, 255 - b
-                painter.setPen(QtGui.QColor(r, g, b))
-                painter.drawText(
-                    x * self.char_w,
-                    y * self.line_h + self.params['font_size'],
-                    ch
-                )
-
-    def _render_to_painter(self, painter, scale=1.0):
-        if self.ascii_symbols is None:
+        serial = self.raster.draw_front(painter)
+        painter.end()
+        if serial != self._displayed_serial:
+            self._displayed_serial = serial
+            self.frames_displayed += 1
+
+    def _render_to_painter(self, painter, frame, scale=1.0):
+        rgb, bg_rgb = frame_colors(frame, self.params)
+        paint_ascii(painter, frame, rgb,
+                    self.params['font_size'] * scale,
+                    self.char_w * scale, self.line_h * scale, bg_rgb,
+                    mono=not self.params['use_color'])
+
+    def _submit_raster(self):
+        if self.frame is None:
             return
-        font = QtGui.QFont("Courier New", int(self.params['font_size'] * scale))
-        painter.setFont(font)
-        painter.setRenderHint(QtGui.QPainter.TextAntialiasing, False)
-        H, W = self.ascii_symbols.shape
-        char_w = self.char_w * scale
-        line_h = self.line_h * scale
-        font_size_scaled = self.params['font_size'] * scale
-        for y in range(H):
-            for x in range(W):
-                ch = self.ascii_symbols[y, x]
-                if self.params['use_color']:
-                    color_arr = self.colors[y, x]
-                else:
-                    val = int(self.gray[y, x])
-                    color_arr = (val, val, val)
-                r, g, b = color_arr
-                if self.params['char_set_name'] == "Dot":
-                    brightness = self.gray[y, x] / 255.0
-                    if self.params['invert']:
-                        r = int(r * (1 - brightness) + 255 * brightness)
-                        g = int(g * (1 - brightness) + 255 * brightness)
-                        b = int(b * (1 - brightness) + 255 * brightness)
-                    else:
-                        r = int(r * brightness)
-                        g = int(g * brightness)
-                        b = int(b * brightness)
-                if self.params['invert']:
-                    r, g, b = 255 - r, 255 - g, 255 - b
-                painter.setPen(QtGui.QColor(r, g, b))
-                painter.drawText(
-                    x * char_w,
-                    y * line_h + font_size_scaled,
-                    ch
-                )
-
-    def _save_pdf_fpdf(self, full_path):
+        self.raster.submit({
+            'frame': self.frame,
+            'params': dict(self.params),
+            'char_w': self.char_w,
+            'line_h': self.line_h,
+        })
+
+    def _save_pdf_fpdf(self, full_path, frame):
         if FPDF is None:
             raise RuntimeError("fpdf2 not available")
         try:
@@ -575,39 +1024,23 @@ class ASCIICameraWidget(QtWidgets.QWidget):
             pdf.add_page()
             mm_per_char_x = 2.1
             mm_per_char_y = 3.5
-            content_w = self.params['ascii_w'] * mm_per_char_x
-            content_h = self.params['ascii_h'] * mm_per_char_y
+            H, W = frame.shape
+            content_w = W * mm_per_char_x
+            content_h = H * mm_per_char_y
             x0 = (210 - content_w) / 2
             y0 = (297 - content_h) / 2
             pdf.set_font("Courier", size=self.params['font_size'] * 0.8)
             bg = (255, 255, 255) if self.params['invert'] else (0, 0, 0)
             pdf.set_fill_color(*bg)
             pdf.rect(0, 0, 210, 297, "F")
-            H, W = self.ascii_symbols.shape
+            rows = frame.rows()
+            rgb = cell_colors(frame.colors, frame.gray, self.params).tolist()
             for y in range(H):
                 for x in range(W):
-                    ch = self.ascii_symbols[y, x]
+                    ch = rows[y][x]
                     if not ch.strip():
                         continue
-                    if self.params['use_color']:
-                        color_arr = self.colors[y, x]
-                    else:
-                        val = int(self.gray[y, x])
-                        color_arr = (val, val, val)
-                    r, g, b = color_arr
-                    if self.params['char_set_name'] == "Dot":
-                        brightness = self.gray[y, x] / 255.0
-                        if self.params['invert']:
-                            r = int(r * (1 - brightness) + 255 * brightness)
-                            g = int(g * (1 - brightness) + 255 * brightness)
-                            b = int(b * (1 - brightness) + 255 * brightness)
-                        else:
-                            r = int(r * brightness)
-                            g = int(g * brightness)
-                            b = int(b * brightness)
-                    if self.params['invert']:
-                        r, g, b = 255 - r, 255 - g, 255 - b
-                    pdf.set_text_color(r, g, b)
+                    pdf.set_text_color(*rgb[y][x])
                     pdf.text(x0 + x * mm_per_char_x, y0 + y * mm_per_char_y + 3, ch)
             pdf.output(full_path)
             return True
@@ -616,30 +1049,32 @@ class ASCIICameraWidget(QtWidgets.QWidget):
             traceback.print_exc()
             return False
 
-    def save_frame(self, fmt="png", quality=95, scale=2):
-        if self.ascii_symbols is None:
+    def save_frame(self, fmt="png", quality=95, scale=2, frame=None, suffix=""):
+        frame = frame if frame is not None else self.frame
+        if frame is None:
             return False, ""
         timestamp = datetime.datetime.now().strftime("%d%m%Y_%H%M%S")
-        filename = f"ascii_{timestamp}.{fmt}"
-        full_path = os.path.join(SAVE_DIR, filename)
+        filename = f"ascii_{timestamp}{suffix}.{fmt}"
+        full_path = os.path.join(save_dir(), filename)
         try:
-            os.makedirs(SAVE_DIR, exist_ok=True)
+            os.makedirs(save_dir(), exist_ok=True)
         except Exception as e:
             print("Mkdir error:", e)
             return False, full_path
         try:
             if fmt == "pdf":
-                success = self._save_pdf_fpdf(full_path)
+                success = self._save_pdf_fpdf(full_path, frame)
                 return success, full_path
             elif fmt in ("png", "jpg"):
-                w_px = int(self.params['ascii_w'] * self.char_w * scale)
-                h_px = int(self.params['ascii_h'] * self.line_h * scale)
+                H, W = frame.shape
+                w_px = int(W * self.char_w * scale)
+                h_px = int(H * self.line_h * scale)
                 img = QtGui.QImage(w_px, h_px, QtGui.QImage.Format_RGB888)
                 bg = QtCore.Qt.black if not self.params['invert'] else QtCore.Qt.white
                 img.fill(bg)
                 painter = QtGui.QPainter(img)
                 painter.scale(scale, scale)
-                self._render_to_painter(painter, scale=1.0)
+                self._render_to_painter(painter, frame, scale=1.0)
                 painter.end()
                 success = img.save(full_path, "PNG" if fmt == "png" else "JPG", quality=quality)
                 return bool(success), full_path
@@ -650,19 +1085,137 @@ class ASCIICameraWidget(QtWidgets.QWidget):
             traceback.print_exc()
             return False, full_path
 
-    def save_current_frame_txt(self):
-        if self.ascii_symbols is None:
+    def render_poster_frame(self, grid_w, grid_h):
+        if self.frame is not None and self.frame.shape == (grid_h, grid_w):
+            return self.frame
+        if self.last_frame_bgr is None:
+            return self.frame
+        if self.history_pos > 0:
+            # Исходник есть только у последнего живого кадра; у кадра из истории — только сетка
+            return None
+        # Отдельный рендерер: без временного сглаживания и без влияния на живую картинку
+        renderer = ASCIIRenderer()
+        renderer.set_chars(self.renderer.chars)
+        renderer.set_dither(self.renderer.dither)
+        return renderer.render(
+            cv2.cvtColor(self.last_frame_bgr, cv2.COLOR_BGR2RGB), grid_w, grid_h,
+            self.params['contrast'], self.params['auto_contrast']
+        )
+
+    def save_poster(self, grid_w, grid_h, dpi=DEFAULTS['poster_dpi'],
+                    tile_rows=DEFAULTS['poster_tile_rows'], frame=None):
+        frame = frame if frame is not None else self.render_poster_frame(grid_w, grid_h)
+        if frame is None:
+            return False, ""
+        timestamp = datetime.datetime.now().strftime("%d%m%Y_%H%M%S")
+        full_path = os.path.join(save_dir(), f"ascii_poster_{timestamp}.png")
+        try:
+            os.makedirs(save_dir(), exist_ok=True)
+        except Exception as e:
+            print("Mkdir error:", e)
+            return False, full_path
+        try:
+            self._write_poster(full_path, frame, dpi, max(1, int(tile_rows)))
+            return True, full_path
+        except Exception as e:
+            print("Poster save error:", e)
+            traceback.print_exc()
+            return False, full_path
+
+    def _write_poster(self, full_path, frame, dpi, tile_rows):
+        # Шрифт задан в пунктах при 96 dpi — масштабируем всю геометрию под нужный dpi
+        scale = dpi / 96.0
+        H, W = frame.shape
+        w_px = int(round(W * self.char_w * scale))
+        h_px = int(round(H * self.line_h * scale))
+        rgb, bg_rgb = frame_colors(frame, self.params)
+        bg = QtCore.Qt.white if self.params['invert'] else QtCore.Qt.black
+        band = None
+        with PNGStreamWriter(full_path, w_px, h_px, dpi=dpi) as writer:
+            for y0 in range(0, H, tile_rows):
+                y1 = min(H, y0 + tile_rows)
+                top = int(round(y0 * self.line_h * scale))
+                bottom = h_px if y1 == H else int(round(y1 * self.line_h * scale))
+                if band is None or band.height() != bottom - top:
+                    band = QtGui.QImage(w_px, bottom - top, QtGui.QImage.Format_RGB888)
+                band.fill(bg)
+                # Соседние строки рисуются с запасом: глифы выступают за границы полосы
+                a, b = max(0, y0 - 1), min(H, y1 + 1)
+                painter = QtGui.QPainter(band)
+                painter.translate(0, -top)
+                painter.scale(scale, scale)
+                painter.translate(0, a * self.line_h)
+                paint_ascii(painter, frame.row_slice(a, b), rgb[a:b],
+                            self.params['font_size'], self.char_w, self.line_h,
+                            None if bg_rgb is None else bg_rgb[a:b],
+                            mono=not self.params['use_color'])
+                painter.end()
+                writer.write_rows(qimage_rows(band))
+
+    def save_vector(self, fmt="svg", frame=None, suffix=""):
+        frame = frame if frame is not None else self.frame
+        if frame is None:
+            return False, ""
+        if fmt not in ("svg", "html"):
+            return False, ""
+        timestamp = datetime.datetime.now().strftime("%d%m%Y_%H%M%S")
+        full_path = os.path.join(save_dir(), f"ascii_{timestamp}{suffix}.{fmt}")
+        try:
+            os.makedirs(save_dir(), exist_ok=True)
+        except Exception as e:
+            print("Mkdir error:", e)
+            return False, full_path
+        rgb = cell_colors(frame.colors, frame.gray, self.params)
+        bg = "#ffffff" if self.params['invert'] else "#000000"
+        try:
+            with open(full_path, "w", encoding="utf-8") as f:
+                if fmt == "svg":
+                    write_svg(f, frame, rgb, bg, self.params['font_size'], self.char_w, self.line_h)
+                else:
+                    write_html(f, frame, rgb, bg, self.params['font_size'])
+            return True, full_path
+        except Exception as e:
+            print(f"{fmt.upper()} save error:", e)
+            traceback.print_exc()
+            return False, full_path
+
+    def save_history_animation(self, first, last, fps=DEFAULTS['animation_fps']):
+        if not len(self.history):
+            return False, ""
+        first = max(0, min(len(self.history) - 1, first))
+        last = max(0, min(len(self.history) - 1, last))
+        backs = range(max(first, last), min(first, last) - 1, -1)
+        timestamp = datetime.datetime.now().strftime("%d%m%Y_%H%M%S")
+        full_path = os.path.join(save_dir(), f"ascii_anim_{timestamp}.html")
+        try:
+            os.makedirs(save_dir(), exist_ok=True)
+        except Exception as e:
+            print("Mkdir error:", e)
+            return False, full_path
+        bg, fg = ("#ffffff", "#000000") if self.params['invert'] else ("#000000", "#ffffff")
+        try:
+            with open(full_path, "w", encoding="utf-8") as f:
+                write_html_animation(f, (self.history.get(b) for b in backs), fps, bg, fg,
+                                     self.params['font_size'])
+            return True, full_path
+        except Exception as e:
+            print("Animation save error:", e)
+            traceback.print_exc()
+            return False, full_path
+
+    def save_current_frame_txt(self, frame=None, suffix=""):
+        frame = frame if frame is not None else self.frame
+        if frame is None:
             return False, ""
         timestamp = datetime.datetime.now().strftime("%d%m%Y_%H%M%S")
-        filename = f"ascii_{timestamp}.txt"
-        full_path = os.path.join(SAVE_DIR, filename)
+        filename = f"ascii_{timestamp}{suffix}.txt"
+        full_path = os.path.join(save_dir(), filename)
         try:
-            os.makedirs(SAVE_DIR, exist_ok=True)
+            os.makedirs(save_dir(), exist_ok=True)
         except Exception as e:
             print("Mkdir error:", e)
             return False, full_path
-        lines = ["".join(row) for row in self.ascii_symbols]
-        text = "\n".join(lines)
+        text = frame.text()
         try:
             with open(full_path, "w", encoding="utf-8") as f:
                 f.write(text)
@@ -672,24 +1225,26 @@ class ASCIICameraWidget(QtWidgets.QWidget):
             return False, full_path
 
     def get_text_ascii(self):
-        if self.ascii_symbols is None:
+        if self.frame is None:
             return ""
-        return "\n".join("".join(row) for row in self.ascii_symbols)
+        return self.frame.text()
 
     def closeEvent(self, event):
         self.timer.stop()
-        if self.cap.isOpened():
-            self.cap.release()
+        self.idle_timer.stop()
+        self.raster.stop()
+        self.release_camera()
         super().closeEvent(event)
 
 # ───────────────────────────────────────────────────────────────
 
 
 class SaveDialog(QtWidgets.QDialog):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, grid=(DEFAULTS['ascii_w'], DEFAULTS['ascii_h'])):
         super().__init__(parent)
         self.setWindowTitle("💾 Save As")
         self.setModal(True)
+        self.grid = grid
         self.init_ui()
 
     def init_ui(self):
@@ -699,11 +1254,41 @@ class SaveDialog(QtWidgets.QDialog):
         self.radio_png = QtWidgets.QRadioButton("PNG (lossless)")
         self.radio_jpg = QtWidgets.QRadioButton("JPEG (95% quality)")
         self.radio_pdf = QtWidgets.QRadioButton("PDF (A4, vector)")
+        self.radio_poster = QtWidgets.QRadioButton("PNG poster (tiled)")
+        self.radio_svg = QtWidgets.QRadioButton("SVG (vector)")
+        self.radio_html = QtWidgets.QRadioButton("HTML")
         self.radio_png.setChecked(True)
         fmt_layout.addWidget(self.radio_png)
         fmt_layout.addWidget(self.radio_jpg)
         fmt_layout.addWidget(self.radio_pdf)
         layout.addLayout(fmt_layout)
+        fmt_layout2 = QtWidgets.QHBoxLayout()
+        fmt_layout2.addWidget(self.radio_poster)
+        fmt_layout2.addWidget(self.radio_svg)
+        fmt_layout2.addWidget(self.radio_html)
+        fmt_layout2.addStretch()
+        layout.addLayout(fmt_layout2)
+
+        poster_layout = QtWidgets.QHBoxLayout()
+        poster_layout.addWidget(QtWidgets.QLabel("Poster grid:"))
+        self.poster_w_spin = QtWidgets.QSpinBox()
+        self.poster_w_spin.setRange(20, 4000)
+        self.poster_w_spin.setValue(self.grid[0] * 3)
+        self.poster_h_spin = QtWidgets.QSpinBox()
+        self.poster_h_spin.setRange(10, 4000)
+        self.poster_h_spin.setValue(self.grid[1] * 3)
+        self.poster_dpi_spin = QtWidgets.QSpinBox()
+        self.poster_dpi_spin.setRange(72, 2400)
+        self.poster_dpi_spin.setValue(DEFAULTS['poster_dpi'])
+        self.poster_dpi_spin.setSuffix(" dpi")
+        poster_layout.addWidget(self.poster_w_spin)
+        poster_layout.addWidget(QtWidgets.QLabel("×"))
+        poster_layout.addWidget(self.poster_h_spin)
+        poster_layout.addWidget(self.poster_dpi_spin)
+        layout.addLayout(poster_layout)
+        for spin in (self.poster_w_spin, self.poster_h_spin, self.poster_dpi_spin):
+            spin.setEnabled(False)
+            self.radio_poster.toggled.connect(spin.setEnabled)
 
         scale_layout = QtWidgets.QHBoxLayout()
         scale_layout.addWidget(QtWidgets.QLabel("HD Scale:"))
@@ -731,9 +1316,73 @@ class SaveDialog(QtWidgets.QDialog):
             fmt = "png"
         elif self.radio_jpg.isChecked():
             fmt = "jpg"
+        elif self.radio_poster.isChecked():
+            fmt = "poster"
+        elif self.radio_svg.isChecked():
+            fmt = "svg"
+        elif self.radio_html.isChecked():
+            fmt = "html"
         else:
             fmt = "pdf"
-        return {'format': fmt, 'scale': self.scale_slider.value()}
+        return {
+            'format': fmt,
+            'scale': self.scale_slider.value(),
+            'poster_w': self.poster_w_spin.value(),
+            'poster_h': self.poster_h_spin.value(),
+            'poster_dpi': self.poster_dpi_spin.value(),
+        }
+
+# ───────────────────────────────────────────────────────────────
+
+
+class HistoryRangeDialog(QtWidgets.QDialog):
+    def __init__(self, count, position=0, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("🎞 Save history range")
+        self.setModal(True)
+        self.count = max(1, count)
+        self.position = position
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QtWidgets.QVBoxLayout()
+        range_layout = QtWidgets.QHBoxLayout()
+        range_layout.addWidget(QtWidgets.QLabel("Frames back from:"))
+        self.from_spin = QtWidgets.QSpinBox()
+        self.from_spin.setRange(0, self.count - 1)
+        self.from_spin.setValue(min(self.count - 1, self.position + 24))
+        self.to_spin = QtWidgets.QSpinBox()
+        self.to_spin.setRange(0, self.count - 1)
+        self.to_spin.setValue(self.position)
+        range_layout.addWidget(self.from_spin)
+        range_layout.addWidget(QtWidgets.QLabel("to:"))
+        range_layout.addWidget(self.to_spin)
+        layout.addLayout(range_layout)
+
+        fmt_layout = QtWidgets.QHBoxLayout()
+        fmt_layout.addWidget(QtWidgets.QLabel("Format:"))
+        self.fmt_combo = QtWidgets.QComboBox()
+        self.fmt_combo.addItems(["png", "jpg", "txt", "svg", "html", "html (animated)"])
+        fmt_layout.addWidget(self.fmt_combo)
+        fmt_layout.addStretch()
+        layout.addLayout(fmt_layout)
+
+        btn_layout = QtWidgets.QHBoxLayout()
+        self.ok_btn = QtWidgets.QPushButton("✅ Save")
+        self.cancel_btn = QtWidgets.QPushButton("❌ Cancel")
+        self.ok_btn.clicked.connect(self.accept)
+        self.cancel_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(self.ok_btn)
+        btn_layout.addWidget(self.cancel_btn)
+        layout.addLayout(btn_layout)
+        self.setLayout(layout)
+
+    def get_settings(self):
+        return {
+            'first': self.from_spin.value(),
+            'last': self.to_spin.value(),
+            'format': self.fmt_combo.currentText(),
+        }
 
 # ───────────────────────────────────────────────────────────────
 
@@ -745,6 +1394,13 @@ class ControlPanel(QtWidgets.QWidget):
     copy_text = QtCore.Signal()
     fullscreen_requested = QtCore.Signal()
     theme_requested = QtCore.Signal()
+    freeze_toggled = QtCore.Signal(bool)
+    motion_gate_toggled = QtCore.Signal(bool)
+    smoothing_toggled = QtCore.Signal(bool)
+    dither_changed = QtCore.Signal(str)
+    fit_toggled = QtCore.Signal(bool)
+    history_seek = QtCore.Signal(int)
+    save_range = QtCore.Signal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -762,6 +1418,15 @@ class ControlPanel(QtWidgets.QWidget):
         self.aspect_lock_cb = QtWidgets.QCheckBox("🔒 Lock H = W × 0.55")
         self.aspect_lock_cb.setChecked(DEFAULTS['lock_aspect'])
         self.aspect_lock_cb.stateChanged.connect(self._on_aspect_lock_changed)
+        self.fit_cb = QtWidgets.QCheckBox("⛶ Fit to view")
+        self.fit_cb.setChecked(DEFAULTS['fit_to_widget'])
+        self.fit_cb.setToolTip("Size the grid to the view and the camera aspect; follows window resizes")
+        self.fit_cb.toggled.connect(self._on_fit_toggled)
+        aspect_layout = QtWidgets.QHBoxLayout()
+        aspect_layout.addWidget(self.aspect_lock_cb)
+        aspect_layout.addWidget(self.fit_cb)
+        aspect_layout.addStretch()
+        self._on_fit_toggled(DEFAULTS['fit_to_widget'], emit=False)
 
         self.contrast_slider = self._make_slider("Contrast", 0.5, 3.0, DEFAULTS['contrast'], "", factor=100)
         self.font_slider = self._make_slider("Font size", 6, 20, DEFAULTS['font_size'], "pt")
@@ -773,6 +1438,13 @@ class ControlPanel(QtWidgets.QWidget):
         self.char_combo.addItems(list(CHAR_SETS.keys()))
         self.char_combo.setCurrentText(DEFAULTS['char_set_name'])
         char_layout.addWidget(self.char_combo)
+        char_layout.addWidget(QtWidgets.QLabel("Dither:"))
+        self.dither_combo = QtWidgets.QComboBox()
+        for key, title in DITHER_MODES.items():
+            self.dither_combo.addItem(title, key)
+        self.dither_combo.setCurrentIndex(self.dither_combo.findData(DEFAULTS['dither']))
+        self.dither_combo.setToolTip("Dithering trades flat bands for a fine pattern that keeps gradients")
+        char_layout.addWidget(self.dither_combo)
         char_layout.addStretch()
 
         toggle_layout = QtWidgets.QHBoxLayout()
@@ -784,7 +1456,15 @@ class ControlPanel(QtWidgets.QWidget):
         self.auto_contrast_cb.setChecked(DEFAULTS['auto_contrast'])
         toggle_layout.addWidget(self.color_cb)
         toggle_layout.addWidget(self.invert_cb)
+        self.motion_gate_cb = QtWidgets.QCheckBox("💤 Skip static")
+        self.motion_gate_cb.setChecked(DEFAULTS['motion_gate'])
+        self.motion_gate_cb.setToolTip("Skip rendering while the scene does not change")
         toggle_layout.addWidget(self.auto_contrast_cb)
+        toggle_layout.addWidget(self.motion_gate_cb)
+        self.smoothing_cb = QtWidgets.QCheckBox("〰 Smooth")
+        self.smoothing_cb.setChecked(DEFAULTS['temporal_smoothing'])
+        self.smoothing_cb.setToolTip("Temporal smoothing with hysteresis to reduce glyph flicker")
+        toggle_layout.addWidget(self.smoothing_cb)
         toggle_layout.addStretch()
 
         btn_layout = QtWidgets.QHBoxLayout()
@@ -802,14 +1482,31 @@ class ControlPanel(QtWidgets.QWidget):
         btn_layout.addWidget(self.fullscreen_btn)
         btn_layout.addWidget(self.theme_btn)
 
+        history_layout = QtWidgets.QHBoxLayout()
+        self.freeze_btn = QtWidgets.QPushButton("⏸ Freeze")
+        self.freeze_btn.setCheckable(True)
+        self.freeze_btn.setToolTip("Freeze the view and scrub through recent frames (Space, ←/→)")
+        self.history_slider = QtWidgets.QSlider(QtCore.Qt.Horizontal)
+        self.history_slider.setRange(0, 0)
+        self.history_slider.setInvertedAppearance(True)
+        self.history_slider.setEnabled(False)
+        self.history_label = QtWidgets.QLabel("live")
+        self.save_range_btn = QtWidgets.QPushButton("🎞 Save range...")
+        self.save_range_btn.setEnabled(False)
+        history_layout.addWidget(self.freeze_btn)
+        history_layout.addWidget(self.history_slider)
+        history_layout.addWidget(self.history_label)
+        history_layout.addWidget(self.save_range_btn)
+
         layout.addLayout(self.width_slider['layout'])
         layout.addLayout(self.height_slider['layout'])
-        layout.addWidget(self.aspect_lock_cb)
+        layout.addLayout(aspect_layout)
         layout.addLayout(self.contrast_slider['layout'])
         layout.addLayout(self.font_slider['layout'])
         layout.addLayout(char_layout)
         layout.addLayout(toggle_layout)
         layout.addLayout(btn_layout)
+        layout.addLayout(history_layout)
         self.setLayout(layout)
 
         self.width_slider['slider'].valueChanged.connect(self._on_width_changed)
@@ -826,6 +1523,13 @@ class ControlPanel(QtWidgets.QWidget):
         self.copy_btn.clicked.connect(self.copy_text)
         self.fullscreen_btn.clicked.connect(self.fullscreen_requested)
         self.theme_btn.clicked.connect(self.theme_requested)
+        self.freeze_btn.toggled.connect(self.freeze_toggled)
+        self.motion_gate_cb.toggled.connect(self.motion_gate_toggled)
+        self.smoothing_cb.toggled.connect(self.smoothing_toggled)
+        self.dither_combo.currentIndexChanged.connect(
+            lambda i: self.dither_changed.emit(self.dither_combo.itemData(i)))
+        self.history_slider.valueChanged.connect(self._on_history_changed)
+        self.save_range_btn.clicked.connect(self.save_range)
 
     def _make_slider(self, name, min_v, max_v, default, suffix="", factor=1):
         slider = QtWidgets.QSlider(QtCore.Qt.Horizontal)
@@ -867,6 +1571,13 @@ class ControlPanel(QtWidgets.QWidget):
     def _on_aspect_lock_changed(self, state):
         self._emit_params()
 
+    def _on_fit_toggled(self, checked, emit=True):
+        # Размер сетки задаёт окно — ручные слайдеры и замок пропорций не действуют
+        for widget in (self.width_slider['slider'], self.height_slider['slider'], self.aspect_lock_cb):
+            widget.setEnabled(not checked)
+        if emit:
+            self.fit_toggled.emit(checked)
+
     def _emit_params(self):
         w = self.width_slider['slider'].value()
         h = self.height_slider['slider'].value()
@@ -895,6 +1606,22 @@ class ControlPanel(QtWidgets.QWidget):
             self.height_slider['slider'].setValue(h)
             self._block_signals = False
 
+    def _on_history_changed(self, value):
+        self.history_label.setText(f"-{value}")
+        if not self._block_signals:
+            self.history_seek.emit(value)
+
+    def set_history_state(self, frozen, count, position=0):
+        self._block_signals = True
+        self.freeze_btn.setChecked(frozen)
+        self.freeze_btn.setText("▶ Live" if frozen else "⏸ Freeze")
+        self.history_slider.setRange(0, max(0, count - 1) if frozen else 0)
+        self.history_slider.setValue(position)
+        self.history_slider.setEnabled(frozen)
+        self.save_range_btn.setEnabled(frozen)
+        self.history_label.setText(f"-{position}" if frozen else "live")
+        self._block_signals = False
+
 # ───────────────────────────────────────────────────────────────
 
 
@@ -933,15 +1660,22 @@ class MainWindow(QtWidgets.QMainWindow):
         self.control_panel.copy_text.connect(self.copy_text)
         self.control_panel.fullscreen_requested.connect(self.toggle_fullscreen)
         self.control_panel.theme_requested.connect(self.cycle_theme)
+        self.control_panel.freeze_toggled.connect(self.set_frozen)
+        self.control_panel.motion_gate_toggled.connect(self.camera_widget.set_motion_gate)
+        self.control_panel.smoothing_toggled.connect(self.camera_widget.set_temporal_smoothing)
+        self.control_panel.dither_changed.connect(self.camera_widget.set_dither)
+        self.control_panel.fit_toggled.connect(self.camera_widget.set_fit_to_widget)
+        self.control_panel.history_seek.connect(self.seek_history)
+        self.control_panel.save_range.connect(self.save_range_dialog)
         self.theme_manager.theme_changed.connect(self.on_theme_changed)
 
         self.status_timer = QtCore.QTimer()
         self.status_timer.timeout.connect(self.update_status)
         self.status_timer.start(500)
 
-        self.orientation_timer = QtCore.QTimer()
-        self.orientation_timer.timeout.connect(self.check_orientation)
-        self.orientation_timer.start(2000)
+        # Ориентация — по сигналам экрана, а не опросом; видимость/фокус — по событиям окна
+        self._watched_screen = None
+        QtGui.QGuiApplication.instance().applicationStateChanged.connect(self.update_power_hints)
 
         self.shortcut_fullscreen = QtGui.QShortcut(QtGui.QKeySequence("F11"), self)
         self.shortcut_fullscreen.activated.connect(self.toggle_fullscreen)
@@ -949,6 +1683,32 @@ class MainWindow(QtWidgets.QMainWindow):
         self.shortcut_save_img.activated.connect(self.save_image_dialog)
         self.shortcut_theme = QtGui.QShortcut(QtGui.QKeySequence("Ctrl+T"), self)
         self.shortcut_theme.activated.connect(self.cycle_theme)
+        # Пробел и стрелки — только когда фокус на картинке: у ползунков и флажков они свои
+        self.shortcut_freeze = QtGui.QShortcut(QtGui.QKeySequence("Space"), self.camera_widget)
+        self.shortcut_freeze.activated.connect(lambda: self.set_frozen(not self.camera_widget.frozen))
+        self.shortcut_older = QtGui.QShortcut(QtGui.QKeySequence("Left"), self.camera_widget)
+        self.shortcut_older.activated.connect(lambda: self.seek_history(self.camera_widget.history_pos + 1))
+        self.shortcut_newer = QtGui.QShortcut(QtGui.QKeySequence("Right"), self.camera_widget)
+        self.shortcut_newer.activated.connect(lambda: self.seek_history(self.camera_widget.history_pos - 1))
+        for shortcut in (self.shortcut_freeze, self.shortcut_older, self.shortcut_newer):
+            shortcut.setContext(QtCore.Qt.WidgetWithChildrenShortcut)
+        self.camera_widget.setFocus()
+        cw = self.camera_widget
+        self.roi_shortcuts = []
+        for keys, action in (
+            (("+", "="), lambda: cw.zoom_roi(1.25)),
+            (("-",), lambda: cw.zoom_roi(0.8)),
+            (("0",), cw.reset_roi),
+            (("Shift+Left",), lambda: cw.pan_roi(-0.1, 0)),
+            (("Shift+Right",), lambda: cw.pan_roi(0.1, 0)),
+            (("Shift+Up",), lambda: cw.pan_roi(0, -0.1)),
+            (("Shift+Down",), lambda: cw.pan_roi(0, 0.1)),
+            (("M",), lambda: cw.set_roi_follow(not cw.roi.follow)),
+        ):
+            for key in keys:
+                shortcut = QtGui.QShortcut(QtGui.QKeySequence(key), self)
+                shortcut.activated.connect(action)
+                self.roi_shortcuts.append(shortcut)
 
     def on_theme_changed(self, mode):
         self.control_panel.update_theme_button(mode)
@@ -963,7 +1723,79 @@ class MainWindow(QtWidgets.QMainWindow):
             char_set_name=char_set_name, lock_aspect=lock_aspect
         )
 
-    def check_orientation(self):
+    def set_frozen(self, frozen):
+        self.camera_widget.set_frozen(frozen)
+        self.control_panel.set_history_state(frozen, len(self.camera_widget.history))
+
+    def seek_history(self, back):
+        pos = self.camera_widget.seek_history(back)
+        self.control_panel.set_history_state(self.camera_widget.frozen, len(self.camera_widget.history), pos)
+
+    def save_range_dialog(self):
+        history = self.camera_widget.history
+        if not len(history):
+            QtWidgets.QMessageBox.warning(self, "⚠️ Empty", "No frames in history.")
+            return
+        dialog = HistoryRangeDialog(len(history), self.camera_widget.history_pos, self)
+        if dialog.exec() == QtWidgets.QDialog.Accepted:
+            settings = dialog.get_settings()
+            if settings['format'] == "html (animated)":
+                success, path = self.camera_widget.save_history_animation(settings['first'], settings['last'])
+                self._show_save_result(success, "HTML", path)
+                return
+            n, paths = self.camera_widget.save_history_range(
+                settings['first'], settings['last'], fmt=settings['format']
+            )
+            fmt = settings['format'].upper()
+            if n:
+                QtWidgets.QMessageBox.information(
+                    self, f"✅ {fmt} Saved", f"Saved {n} frames to:\n{os.path.dirname(paths[0])}"
+                )
+            else:
+                self._show_save_result(False, fmt, save_dir())
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        handle = self.windowHandle()
+        if self._watched_screen is None and handle is not None:
+            handle.screenChanged.connect(self._watch_screen)
+            self._watch_screen(handle.screen())
+        self.update_power_hints()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_power_hints()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() in (QtCore.QEvent.WindowStateChange, QtCore.QEvent.ActivationChange):
+            self.update_power_hints()
+
+    def _watch_screen(self, screen):
+        if self._watched_screen is not None:
+            self._watched_screen.geometryChanged.disconnect(self.check_orientation)
+            self._watched_screen.orientationChanged.disconnect(self.check_orientation)
+        self._watched_screen = screen
+        if screen is not None:
+            screen.geometryChanged.connect(self.check_orientation)
+            screen.orientationChanged.connect(self.check_orientation)
+            self.check_orientation()
+
+    def update_power_hints(self, *_):
+        app_state = QtGui.QGuiApplication.applicationState()
+        visible = (self.isVisible() and not self.isMinimized()
+                   and app_state not in (QtCore.Qt.ApplicationHidden, QtCore.Qt.ApplicationSuspended))
+        focused = self.isActiveWindow() and app_state == QtCore.Qt.ApplicationActive
+        self.camera_widget.set_power_hints(visible, focused)
+        if visible and not self.status_timer.isActive():
+            self.status_timer.start(500)
+            self.update_status()
+        elif not visible:
+            self.status_timer.stop()
+
+    def check_orientation(self, *_):
+        if self.camera_widget.params['fit_to_widget']:
+            return   # сетку ведёт resizeEvent виджета
         screen = self.screen()
         geo = screen.geometry()
         w, h = geo.width(), geo.height()
@@ -982,12 +1814,53 @@ class MainWindow(QtWidgets.QMainWindow):
         w = self.camera_widget.params['ascii_w']   # ✅ Теперь безопасно
         h = self.camera_widget.params['ascii_h']   # ✅
         lock = "🔒" if self.camera_widget.params['lock_aspect'] else "🔓"
-        self.status_label.setText(f"FPS: {self.camera_widget.fps:.1f} | ASCII: {w}×{h} {lock} | Mode: {mode}")
+        rasterized = self.camera_widget.raster.frames_rasterized
+        displayed = self.camera_widget.frames_displayed
+        history = self.camera_widget.history
+        if self.camera_widget.frozen:
+            hist = f"⏸ -{self.camera_widget.history_pos}/{len(history)}"
+        else:
+            hist = f"⏺ {len(history)}/{history.capacity}"
+        skip = self.camera_widget.motion_gate.skip_ratio * 100
+        roi = self.camera_widget.roi
+        if roi.follow:
+            hist += f" | 🎯 {roi.zoom:.1f}×"
+        elif not roi.is_full:
+            hist += f" | 🔍 {roi.zoom:.1f}×"
+        renderer = self.camera_widget.renderer
+        churn = f"Δ {renderer.change_raw * 100:.0f}%→{renderer.change_filtered * 100:.0f}%"
+        power = POWER_LABELS.get(self.camera_widget.power_state, self.camera_widget.power_state)
+        self.status_label.setText(
+            f"FPS: {self.camera_widget.fps:.1f} | ASCII: {w}×{h} {lock} | Mode: {mode}"
+            f" | Frames: {rasterized} drawn / {displayed} shown | Skip: {skip:.0f}% | {churn} | {hist}"
+            f" | {power}"
+        )
 
     def save_image_dialog(self):
-        dialog = SaveDialog(self)
+        params = self.camera_widget.params
+        dialog = SaveDialog(self, grid=(params['ascii_w'], params['ascii_h']))
         if dialog.exec() == QtWidgets.QDialog.Accepted:
             settings = dialog.get_settings()
+            if settings['format'] == 'poster':
+                cw = self.camera_widget
+                frame = cw.render_poster_frame(settings['poster_w'], settings['poster_h'])
+                if frame is None:
+                    QtWidgets.QMessageBox.warning(
+                        self, "⚠️ Poster",
+                        f"An older frame can only be exported at its own grid size "
+                        f"({params['ascii_w']}×{params['ascii_h']}).\n"
+                        f"Return to the live frame (→) or use that size."
+                    )
+                    return
+                success, path = cw.save_poster(
+                    settings['poster_w'], settings['poster_h'], dpi=settings['poster_dpi'], frame=frame
+                )
+                self._show_save_result(success, "Poster PNG", path)
+                return
+            if settings['format'] in ('svg', 'html'):
+                success, path = self.camera_widget.save_vector(fmt=settings['format'])
+                self._show_save_result(success, settings['format'].upper(), path)
+                return
             if settings['format'] == 'pdf' and FPDF is None:
                 QtWidgets.QMessageBox.critical(
                     self, "❌ fpdf2 missing",
@@ -1035,14 +1908,61 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def closeEvent(self, event):
         self.status_timer.stop()
-        self.orientation_timer.stop()
+        self.camera_widget.close()
         super().closeEvent(event)
 
 # ───────────────────────────────────────────────────────────────
 
 
+def run_terminal(args):
+    cap = cv2.VideoCapture(args.camera)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
+    renderer = ASCIIRenderer()
+    renderer.set_chars(CHAR_SETS[args.charset])
+    renderer.set_dither(args.dither)
+    params = dict(DEFAULTS, char_set_name=args.charset, use_color=not args.mono, invert=False)
+    size = os.get_terminal_size() if sys.stdout.isatty() else os.terminal_size((80, 24))
+    out_w = args.width or size.columns
+    out_h = args.height or max(1, size.lines - 1)
+    sys.stdout.write("\x1b[2J\x1b[?25l")
+    try:
+        while True:
+            started = time.time()
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            ascii_frame = renderer.render(frame_rgb, out_w, out_h, params['contrast'], params['auto_contrast'])
+            rgb, bg_rgb = frame_colors(ascii_frame, params)
+            sys.stdout.write("\x1b[H" + ansi_text(ascii_frame, rgb, bg_rgb))
+            sys.stdout.flush()
+            time.sleep(max(0.0, 1.0 / args.fps - (time.time() - started)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sys.stdout.write("\x1b[0m\x1b[?25h\n")
+        cap.release()
+
+
 if __name__ == "__main__":
-    app = QtWidgets.QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="ASCII Camera Pro")
+    parser.add_argument("--terminal", action="store_true", help="render to the terminal with ANSI colours")
+    parser.add_argument("--charset", default=DEFAULTS['char_set_name'], choices=list(CHAR_SETS))
+    parser.add_argument("--width", type=int, default=0, help="grid columns (terminal width by default)")
+    parser.add_argument("--height", type=int, default=0, help="grid rows (terminal height by default)")
+    parser.add_argument("--mono", action="store_true")
+    parser.add_argument("--dither", default=DEFAULTS['dither'], choices=list(DITHER_MODES))
+    parser.add_argument("--fps", type=float, default=15.0)
+    parser.add_argument("--camera", type=int, default=0)
+    parser.add_argument("--idle-release", type=float, default=DEFAULTS['camera_idle_s'],
+                        help="seconds hidden or frozen before the camera is released")
+    cli_args, qt_args = parser.parse_known_args()
+    if cli_args.terminal:
+        sys.exit(run_terminal(cli_args))
+    DEFAULTS['camera_idle_s'] = cli_args.idle_release
+
+    app = QtWidgets.QApplication(sys.argv[:1] + qt_args)
     app.setAttribute(QtCore.Qt.AA_EnableHighDpiScaling)
     app.setAttribute(QtCore.Qt.AA_UseHighDpiPixmaps)
     font = QtGui.QFont()
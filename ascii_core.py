@@ -0,0 +1,1173 @@
+import os
+import sys
+import time
+import functools
+import struct
+import zlib
+import html
+import json
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+# Ядро без Qt и без ввода-вывода при импорте: рендер, кадры, цвета, экспорт.
+# GUI (ascii_camera.py), терминальный режим и фоновые процессы импортируют только его.
+
+# ══════════════════════════════════════════════════════════════
+HALF_BLOCK_CHARS = " ▀▄█"                                     # индекс = верх | низ << 1
+BRAILLE_CHARS = "".join(chr(0x2800 + i) for i in range(256))  # индекс = битовая маска точек 2×4
+
+CHAR_SETS = {
+    "Detailed": " .'`^\",:;Il!i><~+_-?][}{1)(|\\/tfjrxnuvczXYUJCLQ0OZmwqpdbkhao*#MW&8%B@$",
+    "Newspaper": "@#%+=-:. ",
+    "Block": "█▒░ ",
+    "Dot": ".",
+    "LightSmooth": " _.,:;i1tfLCG08@",  # ← НОВЫЙ: 16 символов, равномерная плотность
+    "HalfBlock": HALF_BLOCK_CHARS,      # 1×2 подпикселя: верх/низ своими цветами
+    "Braille": BRAILLE_CHARS,           # 2×4 подпикселя на клетку
+}
+
+# ✅ ИСПРАВЛЕНО: ключи теперь ЕДИНООБРАЗНЫ — 'ascii_w', 'ascii_h', 'char_set_name'
+DEFAULTS = {
+    'ascii_w': 80,          # ← было 'width'
+    'ascii_h': 44,          # ← было 'height'
+    'contrast': 1.3,
+    'font_size': 10,
+    'use_color': True,
+    'invert': False,
+    'auto_contrast': True,
+    'char_set_name': "LightSmooth",
+    'lock_aspect': True,
+    'history_frames': 250,  # кольцевой буфер последних кадров
+    'history_mb': 64,       # потолок памяти буфера
+    'motion_gate': True,
+    'motion_threshold': 1.5,    # средняя разница яркости миниатюр, 0..255; гейт ~40 мкс на 640×480
+    'motion_refresh_s': 2.0,    # принудительная перерисовка даже без движения
+    'temporal_smoothing': False,
+    'temporal_alpha': 0.5,
+    'hysteresis': 0.35,
+    'poster_dpi': 300,
+    'poster_tile_rows': 16,     # строк сетки в одной полосе постера — ограничивает пик памяти
+    'vector_color_levels': 6,   # уровней на канал в SVG/HTML (6 → 216 «web-safe» цветов)
+    'animation_fps': 12,
+    'max_zoom': 8.0,
+    'roi_follow_rate': 0.15,    # доля пути к цели движения за кадр
+    'roi_motion_threshold': 24,  # разница яркости блока миниатюры, считающаяся движением
+    'dither': "none",
+    'frame_interval_ms': 40,
+    'unfocused_interval_ms': 200,   # окно без фокуса: ~5 кадров/с
+    'camera_idle_s': 30.0,          # скрытое/замороженное окно дольше этого — камера освобождается
+    'fit_to_widget': False,
+    'fit_debounce_ms': 150,
+    'mono_levels': 16,      # уровней серого в монохромном экспорте: строка рисуется по прогону на уровень
+}
+
+GRID_LIMITS = ((20, 10), (120, 70))   # (мин. столбцов, строк), (макс. столбцов, строк) — как у слайдеров
+
+DITHER_MODES = {
+    "none": "None",
+    "bayer": "Bayer 8×8",
+    "bluenoise": "Blue noise",
+    "error": "Error diffusion (export quality)",
+}
+
+
+# ✅ Рабочий путь для Pydroid 3 и кросс-платформенный fallback.
+# Проверка записи — только при первом сохранении, не при импорте.
+@functools.lru_cache(maxsize=1)
+def save_dir():
+    if sys.platform == "linux" and "ANDROID_ROOT" in os.environ:
+        candidates = [
+            "/storage/emulated/0/Download/ASCII_Camera/",
+            "/sdcard/Download/ASCII_Camera/",
+        ]
+        for cand in candidates:
+            try:
+                os.makedirs(cand, exist_ok=True)
+                with open(os.path.join(cand, ".test_write"), "w") as f:
+                    f.write("ok")
+                os.remove(os.path.join(cand, ".test_write"))
+                return cand
+            except (OSError, PermissionError, IOError):
+                continue
+    return os.path.expanduser("~/ASCII_Camera/")
+# ===============================================================
+
+
+@functools.lru_cache(maxsize=32)
+def glyph_codes(char_string):
+    # Charset encoded once: one byte per glyph for ASCII sets, UTF-32 otherwise.
+    if char_string.isascii():
+        return np.frombuffer(char_string.encode("ascii"), dtype=np.uint8)
+    return np.frombuffer(char_string.encode("utf-32-le"), dtype=np.uint32)
+
+
+def glyphs_to_text(indices, char_string):
+    codes = glyph_codes(char_string)
+    H, W = indices.shape
+    buf = np.empty((H, W + 1), dtype=codes.dtype)
+    np.take(codes, indices, out=buf[:, :W])
+    buf[:, W] = ord("\n")
+    data = buf.reshape(-1)[:-1].tobytes()
+    return data.decode("ascii" if codes.dtype == np.uint8 else "utf-32-le")
+
+
+class ASCIIFrame:
+    __slots__ = ('indices', 'colors', 'gray', 'chars', 'bg_colors', 'bg_gray')
+
+    def __init__(self, indices, colors, gray, chars, bg_colors=None, bg_gray=None):
+        self.indices = indices
+        self.colors = colors
+        self.gray = gray
+        self.chars = chars
+        # Только для полублоков: цвет нижней половины клетки
+        self.bg_colors = bg_colors
+        self.bg_gray = bg_gray
+
+    @property
+    def shape(self):
+        return self.indices.shape
+
+    def text(self):
+        return glyphs_to_text(self.indices, self.chars)
+
+    def rows(self):
+        return self.text().split("\n")
+
+    def copy(self):
+        if self.bg_colors is None:
+            return ASCIIFrame(self.indices.copy(), self.colors.copy(), self.gray.copy(), self.chars)
+        return ASCIIFrame(self.indices.copy(), self.colors.copy(), self.gray.copy(), self.chars,
+                          self.bg_colors.copy(), self.bg_gray.copy())
+
+    def copy_to(self, dst=None):
+        # Копия в уже выделенный кадр dst, если формы совпадают; иначе — новый кадр
+        if (dst is None or dst.shape != self.shape
+                or (dst.bg_colors is None) != (self.bg_colors is None)):
+            return self.copy()
+        np.copyto(dst.indices, self.indices)
+        np.copyto(dst.colors, self.colors)
+        np.copyto(dst.gray, self.gray)
+        if self.bg_colors is not None:
+            np.copyto(dst.bg_colors, self.bg_colors)
+            np.copyto(dst.bg_gray, self.bg_gray)
+        dst.chars = self.chars
+        return dst
+
+    def row_slice(self, y0, y1):
+        if self.bg_colors is None:
+            return ASCIIFrame(self.indices[y0:y1], self.colors[y0:y1], self.gray[y0:y1], self.chars)
+        return ASCIIFrame(self.indices[y0:y1], self.colors[y0:y1], self.gray[y0:y1], self.chars,
+                          self.bg_colors[y0:y1], self.bg_gray[y0:y1])
+
+
+class FrameHistory:
+    def __init__(self, max_frames=DEFAULTS['history_frames'], max_mb=DEFAULTS['history_mb']):
+        self.max_frames = max_frames
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.capacity = 0
+        self.count = 0
+        self._head = 0
+        self._shape = None
+        self._indices = None
+        self._colors = None
+        self._gray = None
+        self._bg_colors = None
+        self._bg_gray = None
+        self._chars = []
+        self._stamps = None
+
+    def _allocate(self, shape, with_bg=False):
+        H, W = shape
+        # index + RGB + gray; у полублоков ещё RGB и gray нижней половины
+        bytes_per_frame = H * W * (9 if with_bg else 5)
+        self.capacity = max(1, min(self.max_frames, self.max_bytes // max(1, bytes_per_frame)))
+        self._indices = np.zeros((self.capacity, H, W), dtype=np.uint8)
+        self._colors = np.zeros((self.capacity, H, W, 3), dtype=np.uint8)
+        self._gray = np.zeros((self.capacity, H, W), dtype=np.uint8)
+        self._chars = [""] * self.capacity
+        self._stamps = np.zeros(self.capacity, dtype=np.float64)
+        # Цвета низа полублоков — сразу вместе с остальным кольцом, чтобы append не аллоцировал
+        self._bg_colors = np.zeros((self.capacity, H, W, 3), dtype=np.uint8) if with_bg else None
+        self._bg_gray = np.zeros((self.capacity, H, W), dtype=np.uint8) if with_bg else None
+        self._has_bg = np.zeros(self.capacity, dtype=bool)
+        self._shape = shape
+        self.count = 0
+        self._head = 0
+
+    def clear(self):
+        self.count = 0
+        self._head = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, frame, stamp=None):
+        with_bg = frame.bg_colors is not None
+        if frame.shape != self._shape or (with_bg and self._bg_colors is None):
+            # Переход на полублоки пересоздаёт кольцо; обратно — нет, буферы низа просто простаивают
+            self._allocate(frame.shape, with_bg)
+        slot = self._head
+        np.copyto(self._indices[slot], frame.indices)
+        np.copyto(self._colors[slot], frame.colors)
+        np.copyto(self._gray[slot], frame.gray)
+        self._chars[slot] = frame.chars
+        self._stamps[slot] = time.time() if stamp is None else stamp
+        self._has_bg[slot] = with_bg
+        if with_bg:
+            np.copyto(self._bg_colors[slot], frame.bg_colors)
+            np.copyto(self._bg_gray[slot], frame.bg_gray)
+        self._head = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def _slot(self, back):
+        if not 0 <= back < self.count:
+            raise IndexError(f"history position {back} out of range (0..{self.count - 1})")
+        return (self._head - 1 - back) % self.capacity
+
+    def get(self, back=0):
+        # 0 — самый свежий кадр; возвращает представления в буфер без копирования
+        slot = self._slot(back)
+        if self._has_bg[slot]:
+            return ASCIIFrame(self._indices[slot], self._colors[slot], self._gray[slot], self._chars[slot],
+                              self._bg_colors[slot], self._bg_gray[slot])
+        return ASCIIFrame(self._indices[slot], self._colors[slot], self._gray[slot], self._chars[slot])
+
+    def timestamp(self, back=0):
+        return self._stamps[self._slot(back)]
+
+
+def fit_grid(width_px, height_px, char_w, line_h, aspect, limits=GRID_LIMITS):
+    # Самая большая сетка, которая целиком помещается в width_px×height_px и сохраняет пропорции
+    # источника (aspect = ширина / высота) при неквадратной клетке char_w×line_h
+    (min_w, min_h), (max_w, max_h) = limits
+    cols = int(width_px // char_w)
+    rows = min(int(height_px // line_h),
+               int(cols * char_w / (line_h * aspect)),
+               int(max_w * char_w / (line_h * aspect)),
+               max_h)
+    rows = max(min_h, rows)
+    cols = min(cols, max_w, int(round(rows * line_h * aspect / char_w)))
+    return max(min_w, cols), rows
+
+
+def area_bins(size_in, size_out):
+    # Начала интервалов для np.add.reduceat и их длины; при увеличении — ближайший пиксель
+    starts = (np.arange(size_out) * size_in) // size_out
+    counts = np.diff(np.append(starts, size_in))
+    return starts, np.maximum(counts, 1)
+
+
+LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+SUBCELLS = {"halfblock": (2, 1), "braille": (4, 2)}  # (строк, столбцов) подпикселей на клетку
+BRAILLE_WEIGHTS = np.array([[0x01, 0x08],
+                            [0x02, 0x10],
+                            [0x04, 0x20],
+                            [0x40, 0x80]], dtype=np.uint8)
+
+
+def area_resize(img, out_h, out_w):
+    # Усреднение по площади для (..., H, W, C) uint8 → float32; ведущие оси — пакет кадров
+    H, W, C = img.shape[-3:]
+    lead = img.shape[:-3]
+    ys, ny = area_bins(H, out_h)
+    xs, nx = area_bins(W, out_w)
+    # Строки суммируются полосами: один np.add.reduce на выходную строку для всего пакета.
+    # reduceat с приведением типа по полному кадру в разы медленнее.
+    acc = np.uint16 if ny.max() <= 257 else np.uint32
+    rows = img.reshape(lead + (H, W * C))
+    row_sums = np.empty(lead + (out_h, W * C), dtype=acc)
+    for j in range(out_h):
+        y0 = ys[j]
+        np.add.reduce(rows[..., y0:y0 + ny[j], :], axis=-2, dtype=acc, out=row_sums[..., j, :])
+    sums = np.add.reduceat(row_sums.reshape(lead + (out_h, W, C)), xs, axis=-2, dtype=np.uint32)
+    out = sums.astype(np.float32)
+    out /= (ny[:, None] * nx[None, :]).astype(np.float32)[:, :, None]
+    return out
+
+
+def bayer_matrix(order=3):
+    m = np.zeros((1, 1), dtype=np.int32)
+    for _ in range(order):
+        m = np.block([[4 * m, 4 * m + 2], [4 * m + 3, 4 * m + 1]])
+    return ((m + 0.5) / m.size).astype(np.float32)
+
+
+@functools.lru_cache(maxsize=4)
+def blue_noise_matrix(size=64, seed=7):
+    # Приближение blue noise: белый шум, из которого несколько раз вычитается его НЧ-часть
+    # (гаусс в частотной области), с переводом в равномерные ранги после каждого шага
+    rng = np.random.default_rng(seed)
+    noise = rng.random((size, size))
+    f = np.fft.fftfreq(size)
+    lowpass = np.exp(-(f[:, None] ** 2 + f[None, :] ** 2) / (2 * 0.1 ** 2))
+    for _ in range(8):
+        noise = noise - np.real(np.fft.ifft2(np.fft.fft2(noise) * lowpass))
+        ranks = noise.argsort(axis=None).argsort().reshape(size, size)
+        noise = (ranks + 0.5) / noise.size
+    return noise.astype(np.float32)
+
+
+@functools.lru_cache(maxsize=16)
+def dither_thresholds(mode, h, w):
+    # Матрица порогов (0..1), заранее размноженная на всю сетку; кэшируется по размеру
+    m = bayer_matrix() if mode == "bayer" else blue_noise_matrix()
+    reps = (-(-h // m.shape[0]), -(-w // m.shape[1]))
+    tiled = np.ascontiguousarray(np.tile(m, reps)[:h, :w])
+    tiled.setflags(write=False)
+    return tiled
+
+
+def error_diffuse(level, top):
+    # Диффузия ошибки построчно: вся строка квантуется разом, ошибка уходит в следующую
+    # строку с ядром [1/4, 1/2, 1/4]. Внутри строки ошибка не переносится — это качество
+    # для экспорта/офлайна, в живом режиме ordered-дизеринг дешевле и стабильнее во времени.
+    level = level.astype(np.float32)
+    out = np.empty(level.shape, dtype=np.uint8)
+    err = np.zeros(level[..., 0, :].shape, dtype=np.float32)
+    spread = np.empty_like(err)
+    for y in range(level.shape[-2]):
+        v = level[..., y, :] + err
+        q = np.clip(np.floor(v + 0.5), 0, top)
+        out[..., y, :] = q
+        e = v - q
+        np.multiply(e, 0.5, out=spread)
+        spread[..., 1:] += 0.25 * e[..., :-1]
+        spread[..., :-1] += 0.25 * e[..., 1:]
+        err, spread = spread, err
+    return out
+
+
+def dither_quantize(level, top, mode="none", bias=0.0, out=None):
+    # level — непрерывный уровень 0..top; сетка — две последние оси, ведущие оси (пакет) любые.
+    # С out результат пишется туда, а level используется как рабочий буфер и портится.
+    if mode == "error":
+        if out is None:
+            return error_diffuse(level, top)
+        np.copyto(out, error_diffuse(level, top))
+        return out
+    if out is None:
+        if mode in ("bayer", "bluenoise"):
+            level = level + dither_thresholds(mode, level.shape[-2], level.shape[-1])
+        elif bias:
+            level = level + np.float32(bias)
+        return np.clip(level, 0, top).astype(np.uint8)
+    if mode in ("bayer", "bluenoise"):
+        level += dither_thresholds(mode, level.shape[-2], level.shape[-1])
+    elif bias:
+        level += np.float32(bias)
+    np.clip(level, 0, top, out=level)
+    np.copyto(out, level, casting="unsafe")
+    return out
+
+
+def block_mean(arr, sy, sx, row_axis=-2):
+    # Среднее по блокам sy×sx; row_axis — ось строк (-2 для яркости, -3 для RGB)
+    ax = row_axis % arr.ndim
+    h, w = arr.shape[ax] // sy, arr.shape[ax + 1] // sx
+    blocks = arr.reshape(arr.shape[:ax] + (h, sy, w, sx) + arr.shape[ax + 2:])
+    return blocks.mean(axis=(ax + 1, ax + 3), dtype=np.float32)
+
+
+def pack_halfblock(on):
+    # on: (..., 2h, w) bool → индекс в HALF_BLOCK_CHARS
+    return (on[..., 0::2, :].astype(np.uint8) | (on[..., 1::2, :].astype(np.uint8) << 1))
+
+
+def pack_braille(on):
+    # on: (..., 4h, 2w) bool → битовая маска U+2800 для каждой клетки
+    lead = on.shape[:-2]
+    h, w = on.shape[-2] // 4, on.shape[-1] // 2
+    bits = on.reshape(lead + (h, 4, w, 2)).astype(np.uint8)
+    bits *= BRAILLE_WEIGHTS[:, None, :]
+    return bits.sum(axis=(-3, -1), dtype=np.uint8)
+
+
+class BufferPool:
+    # Именованные буферы: пересоздаются только при смене формы или типа (размер сетки, режим)
+    def __init__(self):
+        self._buffers = {}
+        self.allocations = 0
+
+    def get(self, name, shape, dtype=np.uint8):
+        shape = tuple(shape)
+        buf = self._buffers.get(name)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = self._buffers[name] = np.empty(shape, dtype=dtype)
+            self.allocations += 1
+        return buf
+
+    def clear(self):
+        self._buffers.clear()
+
+
+class ASCIIRenderer:
+    def __init__(self, reuse_buffers=False):
+        # reuse_buffers: массивы кадра из render() живут до следующего вызова — для живого
+        # просмотра, где кадр сразу копируется в историю и в растеризатор
+        self.pool = BufferPool() if reuse_buffers else None
+        self.chars = None
+        self.n = 0
+        self.mode = "normal"
+        self.dither = DEFAULTS['dither']
+        self.temporal_alpha = 0.0   # вес нового кадра в EMA; 0 — фильтр выключен
+        self.hysteresis = 0.0       # запас в долях уровня, который надо пересечь для смены символа
+        self.change_raw = 0.0
+        self.change_filtered = 0.0
+        self.settling = False       # EMA ещё отстаёт от кадра больше чем на шаг символа
+        self.reset_temporal()
+
+    def set_chars(self, char_string):
+        self.chars = char_string
+        self.n = len(char_string)
+        if char_string == ".":
+            self.mode = "dot"
+        elif char_string == HALF_BLOCK_CHARS:
+            self.mode = "halfblock"
+        elif char_string == BRAILLE_CHARS:
+            self.mode = "braille"
+        else:
+            self.mode = "normal"
+        self.reset_temporal()
+
+    def set_dither(self, mode):
+        if mode not in DITHER_MODES:
+            raise ValueError(f"unknown dither mode: {mode!r}")
+        self.dither = mode
+        self.reset_temporal()
+
+    def set_temporal(self, alpha=0.0, hysteresis=0.0):
+        self.temporal_alpha = float(alpha)
+        self.hysteresis = float(hysteresis)
+        self.reset_temporal()
+
+    def reset_temporal(self):
+        self._gray_ema = None
+        self._color_ema = None
+        self._prev_raw = None
+        self._prev_indices = None
+        self.settling = False
+
+    def _buffer(self, name, shape, dtype=np.uint8):
+        if self.pool is None:
+            return np.empty(shape, dtype=dtype)
+        return self.pool.get(name, shape, dtype)
+
+    def _quantize(self, gray, out=None, work=None):
+        k = np.float32((self.n - 1) / 255.0)
+        if out is None:
+            return dither_quantize(gray * k, self.n - 1, self.dither)
+        np.multiply(gray, k, out=work)
+        return dither_quantize(work, self.n - 1, self.dither, out=out)
+
+    def _binarize(self, gray):
+        # Порог подпикселей; без дизеринга — 128, как округление
+        return dither_quantize(gray * np.float32(1 / 255.0), 1, self.dither, bias=0.5).astype(bool)
+
+    def render(self, frame_rgb, out_w, out_h, contrast=1.0, auto_contrast=False):
+        sy, sx = SUBCELLS.get(self.mode, (1, 1))
+        size = (out_h * sy, out_w * sx)
+        if frame_rgb.shape[:2] == size:
+            # Уже уменьшен вызывающим (живой просмотр делает это cv2.resize в свой буфер)
+            img = frame_rgb if self.pool is not None else frame_rgb.copy()
+        else:
+            resized = Image.fromarray(frame_rgb).resize((size[1], size[0]), Image.Resampling.LANCZOS)
+            img = np.array(resized)
+        # Все промежуточные массивы — float32 в буферах пула, операции на месте
+        gray = self._buffer('gray', size, np.float32)
+        tmp = self._buffer('tmp', size, np.float32)
+        np.multiply(img[:, :, 0], LUMA[0], out=gray)
+        np.multiply(img[:, :, 1], LUMA[1], out=tmp)
+        gray += tmp
+        np.multiply(img[:, :, 2], LUMA[2], out=tmp)
+        gray += tmp
+        if auto_contrast and gray.size > 0:
+            g_min, g_max = gray.min(), gray.max()
+            if g_max > g_min:
+                gray -= g_min
+                gray *= np.float32(255.0 / (g_max - g_min))
+        else:
+            gray -= 128
+            gray *= np.float32(contrast)
+            gray += 128
+            np.clip(gray, 0, 255, out=gray)
+        return self.render_gray(img, gray)
+
+    def render_gray(self, img, gray):
+        # img — RGB uint8 уже в размере сетки (с подъячейками), gray — float32 яркость после контраста.
+        # Через него рендерит RenderGraph, у которого уменьшение и яркость общие для всех выходов.
+        size = gray.shape
+        tmp = self._buffer('tmp', size, np.float32)
+        gray8 = self._buffer('gray8', size)
+        if self.mode == "dot":
+            indices = self._buffer('indices', size)
+            indices.fill(0)
+            self._track_unfiltered(indices)
+            np.copyto(gray8, gray, casting="unsafe")
+            return ASCIIFrame(indices, img, gray8, self.chars)
+        if self.mode in SUBCELLS:
+            frame = self._render_subcells(img, gray)
+            self._track_unfiltered(frame.indices)
+            return frame
+        level = self._buffer('level', size, np.float32)
+        raw = self._quantize(gray, self._buffer('raw', size), level)
+        if self._prev_raw is None or self._prev_raw.shape != raw.shape:
+            # новая сетка — буферы сглаживания заводятся заново
+            self.reset_temporal()
+            self._gray_ema = gray.astype(np.float32)
+            self._color_ema = img.astype(np.float32)
+            self._prev_raw = raw.copy()
+            self._prev_indices = raw.copy()
+            self.change_raw = self.change_filtered = 1.0
+            np.copyto(gray8, gray, casting="unsafe")
+            return ASCIIFrame(raw, img, gray8, self.chars)
+        changed = self._buffer('changed', size, bool)
+        np.not_equal(raw, self._prev_raw, out=changed)
+        self.change_raw = float(np.count_nonzero(changed)) / raw.size
+        np.copyto(self._prev_raw, raw)
+        if self.temporal_alpha > 0.0:
+            a = np.float32(self.temporal_alpha)
+            self._gray_ema *= 1 - a
+            np.multiply(gray, a, out=tmp)
+            self._gray_ema += tmp
+            # Пока EMA не догнал кадр, гейт движения не должен замораживать полусмешанную картинку
+            np.subtract(gray, self._gray_ema, out=tmp)
+            np.abs(tmp, out=tmp)
+            self.settling = bool(tmp.size) and float(tmp.max()) > 255.0 / max(1, self.n - 1)
+            color_tmp = self._buffer('color_tmp', img.shape, np.float32)
+            self._color_ema *= 1 - a
+            np.multiply(img, a, out=color_tmp)
+            self._color_ema += color_tmp
+            gray = self._gray_ema
+            np.add(self._color_ema, np.float32(0.5), out=color_tmp)
+            img = self._buffer('colors', img.shape)
+            np.copyto(img, color_tmp, casting="unsafe")
+            indices = self._quantize(gray, self._buffer('indices', size), level)
+        else:
+            np.copyto(self._gray_ema, gray)
+            np.copyto(self._color_ema, img)
+            self.settling = False
+            indices = raw
+        if self.hysteresis > 0.0:
+            prev = self._prev_indices
+            np.multiply(gray, np.float32((self.n - 1) / 255.0), out=level)
+            if self.dither in ("bayer", "bluenoise"):
+                level += dither_thresholds(self.dither, *level.shape)
+            # stay: level ∈ (prev − h, min(prev + 1 + h, n − 1)); верхний символ достигается только
+            # при level = n − 1, поэтому граница сверху закрыта, а у самого верхнего её нет
+            level -= prev
+            stay = self._buffer('stay', size, bool)
+            np.greater(level, np.float32(-self.hysteresis), out=stay)
+            upper = self._buffer('upper', size, np.float32)
+            np.subtract(np.float32(self.n - 1), prev, out=upper)
+            np.minimum(upper, np.float32(1.0 + self.hysteresis), out=upper)
+            np.equal(prev, self.n - 1, out=changed)
+            np.copyto(upper, np.float32(np.inf), where=changed)
+            np.less(level, upper, out=changed)
+            stay &= changed
+            np.copyto(indices, prev, where=stay)
+        np.not_equal(indices, self._prev_indices, out=changed)
+        self.change_filtered = float(np.count_nonzero(changed)) / indices.size
+        np.copyto(self._prev_indices, indices)
+        np.copyto(gray8, gray, casting="unsafe")
+        return ASCIIFrame(indices, img, gray8, self.chars)
+
+    def _track_unfiltered(self, indices):
+        # Точки и подъячейки идут без временного фильтра: сырая и итоговая смена совпадают
+        prev = self._prev_indices
+        if prev is None or prev.shape != indices.shape:
+            self._prev_indices = indices.copy()
+            self.change_raw = self.change_filtered = 1.0
+        else:
+            self.change_raw = self.change_filtered = float(np.count_nonzero(prev != indices)) / indices.size
+            np.copyto(prev, indices)
+        self.settling = False
+
+    def _render_subcells(self, img, gray):
+        # Подпиксели порогуются и упаковываются в индекс глифа без циклов
+        on = self._binarize(gray)
+        if self.mode == "halfblock":
+            return ASCIIFrame(pack_halfblock(on), img[0::2].copy(), gray[0::2].astype(np.uint8), self.chars,
+                              img[1::2].copy(), gray[1::2].astype(np.uint8))
+        sy, sx = SUBCELLS[self.mode]
+        colors = (block_mean(img, sy, sx, -3) + 0.5).astype(np.uint8)
+        return ASCIIFrame(pack_braille(on), colors, (block_mean(gray, sy, sx) + 0.5).astype(np.uint8),
+                          self.chars)
+
+    def render_many(self, frames, out_w, out_h, contrast=1.0, auto_contrast=False, chunk_size=8):
+        # Пакетный офлайн-рендер: (N, H, W, 3) или итератор кадров, обрабатываемый чанками.
+        # Усреднение по площади вместо LANCZOS и без временного сглаживания — кадры независимы.
+        if isinstance(frames, np.ndarray):
+            if frames.ndim == 3:
+                frames = frames[None]
+            N = frames.shape[0]
+            indices = np.empty((N, out_h, out_w), dtype=np.uint8)
+            colors = np.empty((N, out_h, out_w, 3), dtype=np.uint8)
+            gray = np.empty((N, out_h, out_w), dtype=np.uint8)
+            for i in range(0, N, chunk_size):
+                part = slice(i, i + chunk_size)
+                indices[part], colors[part], gray[part] = self._render_chunk(
+                    frames[part], out_w, out_h, contrast, auto_contrast)
+            return indices, colors, gray
+        results = []
+        chunk = []
+        for frame in frames:
+            chunk.append(frame)
+            if len(chunk) == chunk_size:
+                results.append(self._render_chunk(np.stack(chunk), out_w, out_h, contrast, auto_contrast))
+                chunk = []
+        if chunk:
+            results.append(self._render_chunk(np.stack(chunk), out_w, out_h, contrast, auto_contrast))
+        if not results:
+            return (np.empty((0, out_h, out_w), dtype=np.uint8),
+                    np.empty((0, out_h, out_w, 3), dtype=np.uint8),
+                    np.empty((0, out_h, out_w), dtype=np.uint8))
+        return tuple(np.concatenate(parts) for parts in zip(*results))
+
+    def _render_chunk(self, stack, out_w, out_h, contrast, auto_contrast):
+        sy, sx = SUBCELLS.get(self.mode, (1, 1))
+        img = area_resize(stack, out_h * sy, out_w * sx)
+        gray = img @ LUMA
+        if auto_contrast:
+            g_min = gray.min(axis=(1, 2), keepdims=True)
+            g_max = gray.max(axis=(1, 2), keepdims=True)
+            span = g_max - g_min
+            stretched = 255 * (gray - g_min) / np.where(span > 0, span, 1)
+            gray = np.where(span > 0, stretched, gray)
+        else:
+            gray = np.clip(128 + (gray - 128) * np.float32(contrast), 0, 255)
+        if self.mode == "dot":
+            indices = np.zeros(gray.shape, dtype=np.uint8)
+        elif self.mode == "halfblock":
+            # Пакетный путь отдаёт только цвет верхней половины
+            indices = pack_halfblock(self._binarize(gray))
+            img, gray = img[:, 0::2], gray[:, 0::2]
+        elif self.mode == "braille":
+            indices = pack_braille(self._binarize(gray))
+            img, gray = block_mean(img, sy, sx, -3), block_mean(gray, sy, sx)
+        else:
+            indices = self._quantize(gray)
+        return indices, (img + 0.5).astype(np.uint8), gray.astype(np.uint8)
+
+
+class RenderNode:
+    # Выход графа: своя сетка, набор символов, дизеринг, временной фильтр и кривая яркости
+    def __init__(self, graph, name, chars, out_w, out_h, contrast=1.0, auto_contrast=False,
+                 dither=DEFAULTS['dither']):
+        self.graph = graph
+        self.name = name
+        self.renderer = ASCIIRenderer(reuse_buffers=True)
+        self.renderer.set_chars(chars)
+        self.renderer.set_dither(dither)
+        self.out_w, self.out_h = out_w, out_h
+        self.contrast = contrast
+        self.auto_contrast = auto_contrast
+        self.lut = None         # своя таблица яркости на 256 значений вместо контраста
+        self._frame = None
+        self._frame_id = 0
+        self.calls = 0
+        self.total_s = 0.0
+        self.last_ms = 0.0
+
+    def set_lut(self, lut):
+        self.lut = None if lut is None else np.asarray(lut, dtype=np.float32).reshape(256)
+
+    def size(self):
+        sy, sx = SUBCELLS.get(self.renderer.mode, (1, 1))
+        return self.out_h * sy, self.out_w * sx
+
+    def contrast_lut(self, gray):
+        if self.lut is not None:
+            return self.lut
+        levels = np.arange(256, dtype=np.float32)
+        if self.auto_contrast and gray.size > 0:
+            g_min, g_max = gray.min(), gray.max()
+            if g_max > g_min:
+                levels -= g_min
+                levels *= np.float32(255.0 / (g_max - g_min))
+            return levels
+        return np.clip(128 + (levels - 128) * np.float32(self.contrast), 0, 255)
+
+    @property
+    def frame(self):
+        # Считается при первом обращении за кадр, дальше отдаётся готовый
+        graph = self.graph
+        if self._frame_id != graph.frame_id:
+            img, luma = graph.resized(*self.size())
+            t = time.perf_counter()
+            buf = self.renderer._buffer
+            lut = self.contrast_lut(luma)
+            # Линейная интерполяция между узлами таблицы: для контраста совпадает с прямым расчётом
+            idx = buf('lut_idx', luma.shape)
+            np.copyto(idx, luma, casting="unsafe")
+            frac = buf('lut_frac', luma.shape, np.float32)
+            np.subtract(luma, idx, out=frac)
+            gray = buf('gray', luma.shape, np.float32)
+            np.take(np.diff(lut, append=lut[-1]), idx, out=gray, mode="clip")
+            frac *= gray
+            np.take(lut, idx, out=gray, mode="clip")
+            gray += frac
+            self._frame = self.renderer.render_gray(img, gray)
+            self._frame_id = graph.frame_id
+            dt = time.perf_counter() - t
+            self.calls += 1
+            self.total_s += dt
+            self.last_ms = dt * 1e3
+        return self._frame
+
+
+class RenderGraph:
+    # Один захват → несколько выходов (виджет, запись, терминал). Усреднение по площади и яркость
+    # для каждого размера в пикселях считаются один раз за кадр и делятся между выходами, сами
+    # выходы — лениво. Пирамида уровней 1/2, 1/4… здесь не окупается: уровень 1/2 стоит дороже,
+    # чем экономит всем выходам вместе, поэтому каждый размер уменьшается прямо из кадра.
+    # Кадры выходов ссылаются на общие буферы и живут до следующего submit().
+    def __init__(self):
+        self.nodes = {}
+        self.frame_id = 0
+        self.shared_ms = {}     # этап → мс на последнем кадре
+        self._source = None
+        self._sized = {}
+
+    def add_output(self, name, chars, out_w, out_h, **options):
+        node = RenderNode(self, name, chars, out_w, out_h, **options)
+        self.nodes[name] = node
+        return node
+
+    def remove_output(self, name):
+        self.nodes.pop(name, None)
+
+    def __getitem__(self, name):
+        return self.nodes[name]
+
+    def submit(self, frame_rgb):
+        # Кадр не копируется — он должен жить, пока выходы не прочитаны
+        self.frame_id += 1
+        self._source = frame_rgb
+        self._sized.clear()
+        self.shared_ms.clear()
+
+    def outputs(self):
+        return {name: node.frame for name, node in self.nodes.items()}
+
+    def _charge(self, stage, t):
+        self.shared_ms[stage] = self.shared_ms.get(stage, 0.0) + (time.perf_counter() - t) * 1e3
+
+    def resized(self, h, w):
+        # (RGB uint8, яркость float32) в размере (h, w) — общие для всех выходов этого размера
+        if (h, w) not in self._sized:
+            src = self._source
+            t = time.perf_counter()
+            if src.shape[:2] == (h, w):
+                img = src
+                gray = src @ LUMA
+            else:
+                f = area_resize(src, h, w)
+                gray = f @ LUMA
+                f += 0.5
+                img = f.astype(np.uint8)
+            self._sized[h, w] = img, gray
+            self._charge(f"resize {w}x{h}", t)
+        return self._sized[h, w]
+
+    def report(self):
+        # (этап, мс) последнего кадра: общие этапы, затем выходы, посчитанные на нём
+        rows = list(self.shared_ms.items())
+        rows += [(name, node.last_ms) for name, node in self.nodes.items()
+                 if node._frame_id == self.frame_id]
+        return rows
+
+
+# ───────────────────────────────────────────────────────────────
+
+
+class MotionGate:
+    def __init__(self, threshold=DEFAULTS['motion_threshold'],
+                 refresh_interval=DEFAULTS['motion_refresh_s'], step=16):
+        self.enabled = DEFAULTS['motion_gate']
+        self.threshold = threshold
+        self.refresh_interval = refresh_interval
+        self.step = step
+        self.frames = 0
+        self.skipped = 0
+        self.skip_ratio = 0.0
+        self.last_diff = 0.0
+        self._thumb = None
+        self._spare = None          # второй буфер миниатюры: меняются местами, без аллокаций
+        self._diff = None
+        self._rows = None
+        self._cols = None
+        self._last_render = 0.0
+
+    def _block_mean(self, frame_bgr, out=None):
+        # Среднее блоков step×step зелёного канала (≈60% яркости) по прореженной сетке: в блоке
+        # берётся каждый 4-й пиксель по обеим осям. 16 отсчётов гасят шум сенсора вчетверо,
+        # а работы в 16 раз меньше, чем у полного усреднения (~30 мкс на 640×480)
+        H, W = frame_bgr.shape[:2]
+        s = max(1, min(self.step, H, W))
+        d = 4 if s % 4 == 0 else 1
+        n = s // d
+        h, w = H // s, W // s
+        green = frame_bgr[:h * s, :w * s, 1]
+        dtype = np.uint16 if n * n * 255 < 1 << 16 else np.uint32
+        rows = self._rows
+        if rows is None or rows.shape != (h, w * n) or rows.dtype != dtype:
+            rows = self._rows = np.empty((h, w * n), dtype=dtype)
+            self._cols = np.empty((h, w), dtype=dtype)
+        cols = self._cols
+        # Сложение срезов с шагом s — сначала по строкам, потом по столбцам, без reduce по осям
+        np.copyto(rows, green[0::s, ::d])
+        for k in range(d, s, d):
+            np.add(rows, green[k::s, ::d], out=rows)
+        np.copyto(cols, rows[:, 0::n])
+        for k in range(1, n):
+            np.add(cols, rows[:, k::n], out=cols)
+        if out is None:
+            out = np.empty((h, w), dtype=np.float32)
+        np.multiply(cols, np.float32(1.0 / (n * n)), out=out)
+        return out
+
+    def thumbnail(self, frame_bgr):
+        return self._block_mean(frame_bgr)
+
+    def invalidate(self):
+        self._thumb = None
+
+    def should_render(self, frame_bgr, now, settling=False):
+        # settling — рендерер ещё сглаживает прошлое изменение: кадр рисуется, даже если сцена стоит
+        self.frames += 1
+        if not self.enabled:
+            self._thumb = None
+            self.skip_ratio *= 0.95
+            return True
+        H, W = frame_bgr.shape[:2]
+        s = max(1, min(self.step, H, W))
+        shape = (H // s, W // s)
+        if self._spare is None or self._spare.shape != shape:
+            self._spare = np.empty(shape, dtype=np.float32)
+            self._diff = np.empty(shape, dtype=np.float32)
+        thumb = self._block_mean(frame_bgr, self._spare)
+        if (not settling and self._thumb is not None and thumb.shape == self._thumb.shape
+                and now - self._last_render < self.refresh_interval):
+            np.subtract(thumb, self._thumb, out=self._diff)
+            np.abs(self._diff, out=self._diff)
+            self.last_diff = float(self._diff.sum()) / thumb.size
+            if self.last_diff < self.threshold:
+                self.skipped += 1
+                self.skip_ratio = 0.95 * self.skip_ratio + 0.05
+                return False
+        self._spare, self._thumb = self._thumb, thumb
+        self._last_render = now
+        self.skip_ratio *= 0.95
+        return True
+
+# ───────────────────────────────────────────────────────────────
+
+
+def cell_colors(colors, gray, params, out=None):
+    if params['char_set_name'] != "Dot":
+        # Без Dot цвет — это копия или инверсия: цветной неинвертированный кадр отдаётся как есть
+        src = colors if params['use_color'] else gray[:, :, None]
+        if src is colors and not params['invert']:
+            return colors
+        if out is None:
+            out = np.empty(colors.shape, dtype=np.uint8)
+        if params['invert']:
+            np.subtract(255, src, out=out)
+        else:
+            np.copyto(out, src)
+        return out
+    if params['use_color']:
+        rgb = colors.astype(np.float32)
+    else:
+        rgb = np.repeat(gray[:, :, None], 3, axis=2).astype(np.float32)
+    if params['char_set_name'] == "Dot":
+        brightness = gray[:, :, None] / np.float32(255.0)
+        if params['invert']:
+            rgb = rgb * (1 - brightness) + 255 * brightness
+        else:
+            rgb = rgb * brightness
+    rgb = rgb.astype(np.uint8)
+    if params['invert']:
+        rgb = 255 - rgb
+    return rgb
+
+
+def frame_colors(frame, params, pool=None):
+    out = None if pool is None else pool.get('rgb', frame.colors.shape)
+    rgb = cell_colors(frame.colors, frame.gray, params, out)
+    if frame.bg_colors is None:
+        return rgb, None
+    out = None if pool is None else pool.get('bg_rgb', frame.bg_colors.shape)
+    return rgb, cell_colors(frame.bg_colors, frame.bg_gray, params, out)
+
+
+def ansi_text(frame, rgb, bg_rgb=None):
+    # 24-битные ANSI-цвета; escape-последовательность выводится один раз на прогон одного цвета
+    H, W = frame.shape
+    key = (rgb[..., 0].astype(np.uint64) << 16) | (rgb[..., 1].astype(np.uint64) << 8) | rgb[..., 2]
+    if bg_rgb is not None:
+        key |= ((bg_rgb[..., 0].astype(np.uint64) << 16) | (bg_rgb[..., 1].astype(np.uint64) << 8)
+                | bg_rgb[..., 2]) << 24
+        # В терминале у полублока два цвета, поэтому всегда «▀» с фоном снизу
+        rows = ["▀" * W] * H
+    else:
+        rows = frame.rows()
+    lines = []
+    for y in range(H):
+        cuts = (np.flatnonzero(np.diff(key[y])) + 1).tolist()
+        row_rgb = rgb[y].tolist()
+        row_bg = None if bg_rgb is None else bg_rgb[y].tolist()
+        parts = []
+        for a, b in zip([0] + cuts, cuts + [W]):
+            r, g, bl = row_rgb[a]
+            seq = f"\x1b[38;2;{r};{g};{bl}m"
+            if row_bg is not None:
+                r, g, bl = row_bg[a]
+                seq += f"\x1b[48;2;{r};{g};{bl}m"
+            parts.append(seq + rows[y][a:b])
+        lines.append("".join(parts) + "\x1b[0m")
+    return "\n".join(lines)
+
+
+# Android (Pydroid) не ищет шрифты по имени — системные указаны полным путём
+MONO_FONTS = ("DejaVuSansMono.ttf", "cour.ttf", "Courier New.ttf",
+              "LiberationMono-Regular.ttf", "Menlo.ttc",
+              "/system/fonts/DroidSansMono.ttf", "/system/fonts/CutiveMono.ttf")
+
+
+@functools.lru_cache(maxsize=8)
+def mono_font(px):
+    for name in MONO_FONTS:
+        try:
+            return ImageFont.truetype(name, px)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size=px)
+    except TypeError:
+        # Pillow < 10.1: только растровый шрифт без размера
+        return ImageFont.load_default()
+
+
+@functools.lru_cache(maxsize=8)
+def glyph_atlas(chars, font_size, char_w, line_h):
+    # Маски покрытия глифов (n, line_h, char_w); базовая линия как у Qt — font_size от верха клетки
+    font = mono_font(max(1, round(font_size * 4 / 3)))   # pt → px при 96 dpi
+    atlas = np.zeros((len(chars), line_h, char_w), dtype=np.uint8)
+    cell = Image.new("L", (char_w, line_h))
+    draw = ImageDraw.Draw(cell)
+    for i, ch in enumerate(chars):
+        if ch.isspace():
+            continue
+        draw.rectangle((0, 0, char_w, line_h), fill=0)
+        if isinstance(font, ImageFont.FreeTypeFont):
+            draw.text((0, font_size), ch, fill=255, font=font, anchor="ls")
+        else:
+            # Растровый шрифт якорей не знает — строка высотой ~11 px по центру клетки
+            try:
+                draw.text((0, max(0, (line_h - 11) // 2)), ch, fill=255, font=font)
+            except UnicodeEncodeError:
+                # ...и умеет только latin-1: блоки и Брайль — заливкой с плотностью символа
+                code = ord(ch) - 0x2800
+                density = bin(code).count("1") / 8 if 0 <= code < 0x100 else i / max(1, len(chars) - 1)
+                draw.rectangle((0, 0, char_w, line_h), fill=round(255 * density))
+        atlas[i] = np.asarray(cell)
+    atlas.setflags(write=False)
+    return atlas
+
+
+def rasterize(frame, rgb, bg, font_size, char_w, line_h, bg_rgb=None, out=None, pool=None):
+    # Растеризация без Qt: маски глифов выбираются из атласа по индексам и смешиваются с фоном.
+    # Результат — RGB (H·line_h, W·char_w, 3), uint8; с out и pool — без новых массивов.
+    H, W = frame.shape
+    char_w, line_h = int(char_w), int(line_h)
+    if out is None:
+        out = np.empty((H * line_h, W * char_w, 3), dtype=np.uint8)
+    cells = out.reshape(H, line_h, W, char_w, 3)
+    if bg_rgb is not None:
+        # Полублоки: верхняя половина клетки — rgb, нижняя — bg_rgb
+        half = line_h // 2
+        cells[:, :half] = rgb[:, None, :, None]
+        cells[:, half:] = bg_rgb[:, None, :, None]
+        return out
+    if pool is None:
+        pool = BufferPool()
+    atlas = glyph_atlas(frame.chars, font_size, char_w, line_h)
+    idx = pool.get('glyph_idx', (H, W), np.intp)
+    np.copyto(idx, frame.indices)
+    masks = pool.get('masks', (H, W, line_h, char_w))
+    np.take(atlas, idx, axis=0, out=masks, mode="clip")
+    m = pool.get('mask16', (H, line_h, W, char_w, 1), np.uint16)
+    np.copyto(m[..., 0], masks.transpose(0, 2, 1, 3))
+    # m·fg + (255 − m)·bg ≤ 255² — помещается в uint16
+    acc = pool.get('acc', (H, line_h, W, char_w, 3), np.uint16)
+    tmp = pool.get('acc_tmp', acc.shape, np.uint16)
+    np.multiply(m, rgb[:, None, :, None], out=acc)
+    if any(bg):
+        np.subtract(255, m, out=m)
+        np.multiply(m, np.asarray(bg, dtype=np.uint8), out=tmp)
+        acc += tmp
+    # x / 255 с округлением без деления: (x + 128 + ((x + 128) >> 8)) >> 8
+    acc += 128
+    np.right_shift(acc, 8, out=tmp)
+    acc += tmp
+    acc >>= 8
+    np.copyto(cells, acc, casting="unsafe")
+    return out
+
+# ───────────────────────────────────────────────────────────────
+
+
+class PNGStreamWriter:
+    SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+    def __init__(self, path, width, height, dpi=None, level=6):
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self._z = zlib.compressobj(level)
+        self._f = open(path, "wb")
+        try:
+            self._f.write(self.SIGNATURE)
+            # 8 бит на канал, RGB, без интерлейсинга
+            self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            if dpi:
+                ppm = int(round(dpi / 0.0254))
+                self._chunk(b"pHYs", struct.pack(">IIB", ppm, ppm, 1))
+        except Exception:
+            self._f.close()
+            raise
+
+    def _chunk(self, tag, data):
+        self._f.write(struct.pack(">I", len(data)))
+        self._f.write(tag)
+        self._f.write(data)
+        self._f.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(tag)) & 0xFFFFFFFF))
+
+    def write_rows(self, rgb):
+        h = rgb.shape[0]
+        if rgb.shape[1:] != (self.width, 3):
+            raise ValueError(f"expected rows of shape (*, {self.width}, 3), got {rgb.shape}")
+        if self.rows_written + h > self.height:
+            raise ValueError("more rows than declared image height")
+        # Фильтр Sub (тип 1): разность с левым пикселем, векторно для всей полосы
+        line = rgb.reshape(h, -1)
+        filtered = np.empty((h, line.shape[1] + 1), dtype=np.uint8)
+        filtered[:, 0] = 1
+        filtered[:, 1:4] = line[:, :3]
+        np.subtract(line[:, 3:], line[:, :-3], out=filtered[:, 4:])
+        data = self._z.compress(filtered.tobytes())
+        if data:
+            self._chunk(b"IDAT", data)
+        self.rows_written += h
+
+    def close(self):
+        if self._f.closed:
+            return
+        try:
+            if self.rows_written == self.height:
+                self._chunk(b"IDAT", self._z.flush())
+                self._chunk(b"IEND", b"")
+        finally:
+            self._f.close()
+        if self.rows_written != self.height:
+            raise ValueError(f"PNG incomplete: {self.rows_written}/{self.height} rows written")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._f.close()
+
+
+def color_classes(frame, rgb, levels=DEFAULTS['vector_color_levels']):
+    # Квантованный цвет → ключ; пробелы наследуют ключ слева, чтобы не рвать прогоны
+    q = (rgb.astype(np.uint32) * (levels - 1) + 127) // 255
+    # levels³ не влезает в uint16 уже при levels > 40 — ключи в uint32
+    keys = (q[:, :, 0] * levels + q[:, :, 1]) * levels + q[:, :, 2]
+    space = glyph_codes(frame.chars)[frame.indices] == ord(" ")
+    if space.any():
+        H, W = keys.shape
+        src = np.where(space, 0, np.arange(W))
+        np.maximum.accumulate(src, axis=1, out=src)
+        keys = np.take_along_axis(keys, src, axis=1)
+    palette, classes = np.unique(keys, return_inverse=True)
+    classes = classes.reshape(keys.shape)
+    qr = palette // (levels * levels)
+    qg = (palette // levels) % levels
+    qb = palette % levels
+    css = np.stack([qr, qg, qb], axis=1) * 255 // (levels - 1)
+    return classes, ["#%02x%02x%02x" % tuple(c) for c in css.tolist()]
+
+
+def iter_runs(row_text, row_classes):
+    cuts = np.flatnonzero(np.diff(row_classes)) + 1
+    starts = [0] + cuts.tolist()
+    ends = cuts.tolist() + [len(row_text)]
+    for a, b in zip(starts, ends):
+        yield int(row_classes[a]), html.escape(row_text[a:b], quote=False)
+
+
+def write_svg(f, frame, rgb, bg, font_size, char_w, line_h, levels=DEFAULTS['vector_color_levels']):
+    H, W = frame.shape
+    classes, colors = color_classes(frame, rgb, levels)
+    width, height = W * char_w, H * line_h
+    f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}">\n<style>\n')
+    f.write(f"text{{font-family:'Courier New',monospace;font-size:{font_size}pt;white-space:pre}}\n")
+    for i, color in enumerate(colors):
+        f.write(f".c{i}{{fill:{color}}}\n")
+    f.write(f'</style>\n<rect width="100%" height="100%" fill="{bg}"/>\n')
+    for y, row in enumerate(frame.rows()):
+        f.write(f'<text x="0" y="{y * line_h + font_size}" textLength="{width}" '
+                f'lengthAdjust="spacing" xml:space="preserve">')
+        for cls, text in iter_runs(row, classes[y]):
+            f.write(f'<tspan class="c{cls}">{text}</tspan>')
+        f.write("</text>\n")
+    f.write("</svg>\n")
+
+
+def write_html(f, frame, rgb, bg, font_size, levels=DEFAULTS['vector_color_levels']):
+    classes, colors = color_classes(frame, rgb, levels)
+    f.write('<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>ASCII Camera</title>\n<style>\n')
+    f.write(f"body{{background:{bg};margin:0}}\n")
+    f.write(f"pre{{font-family:'Courier New',monospace;font-size:{font_size}pt;line-height:1.2;margin:0}}\n")
+    for i, color in enumerate(colors):
+        f.write(f".c{i}{{color:{color}}}\n")
+    f.write("</style></head><body><pre>")
+    for y, row in enumerate(frame.rows()):
+        if y:
+            f.write("\n")
+        for cls, text in iter_runs(row, classes[y]):
+            f.write(f'<span class="c{cls}">{text}</span>')
+    f.write("</pre></body></html>\n")
+
+
+def write_html_animation(f, frames, fps, bg, fg, font_size):
+    # Таблица уникальных кадров + последовательность индексов: статичные сцены не дублируются
+    texts = {}
+    seq = []
+    f.write('<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>ASCII Camera</title>\n<style>\n')
+    f.write(f"body{{background:{bg};color:{fg};margin:0}}\n")
+    f.write(f"pre{{font-family:'Courier New',monospace;font-size:{font_size}pt;line-height:1.2;margin:0}}\n")
+    f.write('</style></head><body><pre id="ascii"></pre>\n<script>\nconst FRAMES={"texts":[')
+    for frame in frames:
+        text = frame.text()
+        idx = texts.get(text)
+        if idx is None:
+            idx = texts[text] = len(texts)
+            if idx:
+                f.write(",")
+            f.write(json.dumps(text, ensure_ascii=False).replace("</", "<\\/"))
+        seq.append(idx)
+    f.write('],"seq":' + json.dumps(seq, separators=(",", ":")) + "};\n")
+    f.write(f"const FPS={float(fps)};\n")
+    f.write("const el=document.getElementById('ascii');let i=0;\n"
+            "function show(){el.textContent=FRAMES.texts[FRAMES.seq[i]];i=(i+1)%FRAMES.seq.length;}\n"
+            "show();setInterval(show,1000/FPS);\n</script></body></html>\n")
+    return len(seq), len(texts)
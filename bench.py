@@ -0,0 +1,327 @@
+import os
+import sys
+import time
+import argparse
+import subprocess
+import tracemalloc
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from ascii_core import (ASCIIRenderer, BufferPool, CHAR_SETS, DEFAULTS, DITHER_MODES, MotionGate,
+                        RenderGraph, SUBCELLS, area_resize, frame_colors, rasterize)
+
+
+def synthetic_frames(n, h=480, w=640, seed=0):
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:h, 0:w].astype(np.float32)
+    base = np.stack([xx * 255 / w, yy * 255 / h, 128 + 100 * np.sin(xx / 40) * np.cos(yy / 50)], -1)
+    frames = np.empty((n, h, w, 3), dtype=np.uint8)
+    for i in range(n):
+        frames[i] = np.clip(np.roll(base, 7 * i, axis=1) + rng.normal(0, 6, base.shape), 0, 255)
+    return frames
+
+
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def bench_render_many(args):
+    frames = synthetic_frames(args.frames)
+    renderer = ASCIIRenderer()
+    renderer.set_chars(CHAR_SETS[DEFAULTS['char_set_name']])
+    print(f"{args.frames} frames 640x480 -> grid {args.width}x{args.height}, per-frame times in ms")
+
+    def loop_render():
+        for frame in frames:
+            renderer.render(frame, args.width, args.height, 1.3, True)
+
+    def loop_single():
+        for frame in frames:
+            renderer.render_many(frame, args.width, args.height, 1.3, True)
+
+    t = best_of(loop_render, args.repeat) / args.frames
+    print(f"{'render() loop (LANCZOS)':<28}{t * 1e3:8.3f}")
+    base = best_of(loop_single, args.repeat) / args.frames
+    print(f"{'render_many, batch 1':<28}{base * 1e3:8.3f}")
+    for batch in args.batches:
+        t = best_of(lambda: renderer.render_many(frames, args.width, args.height, 1.3, True,
+                                                 chunk_size=batch), args.repeat) / args.frames
+        print(f"{f'render_many, batch {batch}':<28}{t * 1e3:8.3f}   x{base / t:.2f} vs batch 1")
+
+
+def bench_dither(args):
+    frames = synthetic_frames(args.frames)
+    print(f"render() per frame, grid {args.width}x{args.height}, times in ms")
+    for name in args.charsets:
+        renderer = ASCIIRenderer()
+        renderer.set_chars(CHAR_SETS[name])
+        base = None
+        for mode in DITHER_MODES:
+            renderer.set_dither(mode)
+
+            def loop():
+                for frame in frames:
+                    renderer.render(frame, args.width, args.height, 1.3, True)
+
+            t = best_of(loop, args.repeat) / args.frames
+            base = t if base is None else base
+            print(f"{name:<12}{mode:<12}{t * 1e3:8.3f}   +{(t - base) * 1e3:.3f}")
+
+
+def import_time(module):
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                         cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def pool_job(seed):
+    frame = synthetic_frames(1, seed=seed)[0]
+    renderer = ASCIIRenderer()
+    renderer.set_chars(CHAR_SETS[DEFAULTS['char_set_name']])
+    ascii_frame = renderer.render(frame, DEFAULTS['ascii_w'], DEFAULTS['ascii_h'])
+    rgb, bg_rgb = frame_colors(ascii_frame, DEFAULTS)
+    return rasterize(ascii_frame, rgb, (0, 0, 0), DEFAULTS['font_size'], 8, 14, bg_rgb).shape
+
+
+def bench_import(args):
+    print("cold import in a fresh interpreter, best of", args.repeat)
+    for module in args.modules:
+        try:
+            t = min(import_time(module) for _ in range(args.repeat))
+        except subprocess.CalledProcessError as e:
+            print(f"{module:<16}failed: {e.stderr.strip().splitlines()[-1]}")
+            continue
+        print(f"{module:<16}{t * 1e3:8.1f} ms")
+    ctx = multiprocessing.get_context("spawn")
+    t = time.perf_counter()
+    with ProcessPoolExecutor(args.workers, mp_context=ctx) as pool:
+        shapes = list(pool.map(pool_job, range(args.workers)))
+    t = time.perf_counter() - t
+    print(f"spawn pool of {args.workers}, one render+rasterize each: {t * 1e3:.0f} ms -> {shapes[0]}")
+
+
+def live_pipeline(pooled, width, height, charset):
+    # Тот же путь, что у живого просмотра: захват → уменьшение → рендер → копия для потока → растр
+    import cv2
+    renderer = ASCIIRenderer(reuse_buffers=pooled)
+    renderer.set_chars(CHAR_SETS[charset])
+    gate = MotionGate()
+    gate.enabled = False
+    params = dict(DEFAULTS, char_set_name=charset)
+    buffers, raster_pool = BufferPool(), BufferPool()
+    state = {'capture': None, 'staged': None, 'pixels': None}
+
+    def step(source):
+        if pooled:
+            # cap.read(image=buf) — кадр камеры пишется в прежний буфер
+            capture = state['capture'] = state['capture'] if state['capture'] is not None else source.copy()
+            np.copyto(capture, source)
+            gate.should_render(capture, 0.0)
+            small = buffers.get('small_bgr', (height, width, 3))
+            cv2.resize(capture, (width, height), dst=small, interpolation=cv2.INTER_AREA)
+            rgb_in = buffers.get('small_rgb', (height, width, 3))
+            cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=rgb_in)
+            frame = renderer.render(rgb_in, width, height, params['contrast'], params['auto_contrast'])
+            staged = state['staged'] = frame.copy_to(state['staged'])
+            rgb, bg_rgb = frame_colors(staged, params, raster_pool)
+            if state['pixels'] is None:
+                state['pixels'] = np.empty((height * 14, width * 8, 3), dtype=np.uint8)
+            rasterize(staged, rgb, (0, 0, 0), params['font_size'], 8, 14, bg_rgb,
+                      out=state['pixels'], pool=raster_pool)
+        else:
+            capture = source.copy()
+            gate.should_render(capture, 0.0)
+            rgb_in = cv2.cvtColor(capture, cv2.COLOR_BGR2RGB)
+            frame = renderer.render(rgb_in, width, height, params['contrast'], params['auto_contrast'])
+            staged = frame.copy()
+            rgb, bg_rgb = frame_colors(staged, params)
+            rasterize(staged, rgb, (0, 0, 0), params['font_size'], 8, 14, bg_rgb)
+
+    return step
+
+
+def bench_alloc(args):
+    frames = synthetic_frames(args.frames)
+    print(f"live path, grid {args.width}x{args.height}, {args.charset}; transient = peak traced bytes above "
+          f"the steady state during one frame")
+    for pooled in (False, True):
+        step = live_pipeline(pooled, args.width, args.height, args.charset)
+        for frame in frames[:args.warmup]:
+            step(frame)
+        t = best_of(lambda: [step(f) for f in frames], args.repeat) / len(frames)
+        tracemalloc.start()
+        peaks, growth = [], []
+        for frame in frames:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            step(frame)
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            growth.append(current - before)
+        tracemalloc.stop()
+        name = "pooled" if pooled else "allocating"
+        print(f"{name:<12}{t * 1e3:8.2f} ms/frame   transient {np.median(peaks) / 1024:9.1f} KiB/frame"
+              f"   retained {np.median(growth) / 1024:6.1f} KiB/frame")
+
+
+def bench_paint(args):
+    # QPainter-путь экспорта: по клетке vs монохромные прогоны QStaticText
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6 import QtCore, QtGui
+    import ascii_camera
+    app = QtGui.QGuiApplication.instance() or QtGui.QGuiApplication([])
+    fm = QtGui.QFontMetrics(QtGui.QFont("Courier New", DEFAULTS['font_size']))
+    char_w, line_h = fm.horizontalAdvance("W"), fm.height() + 2
+    moving = synthetic_frames(args.frames)
+    scenes = {"moving": moving, "static": np.repeat(moving[:1], args.frames, axis=0)}
+    cache = ascii_camera.STATIC_TEXT
+    print(f"paint_ascii, grid {args.width}x{args.height}, monochrome, per-frame")
+    for name in args.charsets:
+        params = dict(DEFAULTS, char_set_name=name, use_color=False)
+        renderer = ASCIIRenderer()
+        renderer.set_chars(CHAR_SETS[name])
+        for scene, frames in scenes.items():
+            ascii_frames = [renderer.render(f, args.width, args.height, 1.3, True) for f in frames]
+            colors = [frame_colors(f, params)[0] for f in ascii_frames]
+            img = QtGui.QImage(args.width * char_w, args.height * line_h, QtGui.QImage.Format_RGB888)
+            for mono in (False, True):
+                hits, misses = cache.hits, cache.misses
+                calls = 0
+                t = time.perf_counter()
+                for frame, rgb in zip(ascii_frames, colors):
+                    img.fill(QtCore.Qt.black)
+                    painter = QtGui.QPainter(img)
+                    ascii_camera.paint_ascii(painter, frame, rgb, DEFAULTS['font_size'], char_w, line_h,
+                                             mono=mono)
+                    painter.end()
+                    calls += cache.draw_calls
+                t = (time.perf_counter() - t) / len(frames)
+                lookups = cache.hits - hits + cache.misses - misses
+                hit_rate = f"{(cache.hits - hits) / lookups * 100:5.1f}%" if lookups else "    -"
+                label = "runs" if mono else "cells"
+                print(f"{name:<12}{scene:<8}{label:<6}{t * 1e3:8.2f} ms  {calls / len(frames):7.0f} draw calls"
+                      f"  cache hits {hit_rate}")
+    del app
+
+
+def parse_output(spec):
+    # имя:набор:ШxВ
+    name, charset, size = spec.split(":")
+    w, h = size.lower().split("x")
+    return name, charset, int(w), int(h)
+
+
+def bench_graph(args):
+    # Несколько выходов с одного кадра: отдельные render() vs граф с общими уменьшениями
+    frames = synthetic_frames(args.frames)
+    outputs = [parse_output(spec) for spec in args.outputs]
+    print(f"{len(outputs)} outputs from one 640x480 frame, per-frame times in ms")
+    renderers = []
+    for name, charset, w, h in outputs:
+        renderer = ASCIIRenderer()
+        renderer.set_chars(CHAR_SETS[charset])
+        renderers.append((renderer, w, h))
+
+    def loop_separate():
+        for frame in frames:
+            for renderer, w, h in renderers:
+                renderer.render(frame, w, h, 1.3)
+
+    def loop_separate_area():
+        # Тот же ресемплер, что у графа, но каждый выход уменьшает полный кадр сам
+        for frame in frames:
+            for renderer, w, h in renderers:
+                sy, sx = SUBCELLS.get(renderer.mode, (1, 1))
+                small = area_resize(frame, h * sy, w * sx)
+                small += 0.5
+                renderer.render(small.astype(np.uint8), w, h, 1.3)
+
+    graph = RenderGraph()
+    for name, charset, w, h in outputs:
+        graph.add_output(name, CHAR_SETS[charset], w, h, contrast=1.3)
+
+    def loop_graph():
+        for frame in frames:
+            graph.submit(frame)
+            graph.outputs()
+
+    t = best_of(loop_separate, args.repeat) / args.frames
+    print(f"{'separate render() (LANCZOS)':<28}{t * 1e3:8.3f}")
+    separate = best_of(loop_separate_area, args.repeat) / args.frames
+    print(f"{'separate, area resize each':<28}{separate * 1e3:8.3f}")
+    t = best_of(loop_graph, args.repeat) / args.frames
+    print(f"{'render graph':<28}{t * 1e3:8.3f}   x{separate / t:.2f} vs separate area resize")
+    costs = {}
+    for frame in frames:
+        graph.submit(frame)
+        graph.outputs()
+        for stage, ms in graph.report():
+            costs[stage] = costs.get(stage, 0.0) + ms
+    for stage, ms in costs.items():
+        label = stage if stage not in graph.nodes else f"  node {stage}"
+        print(f"{label:<28}{ms / args.frames:8.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ASCII Camera micro-benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("render_many", help="batched render vs per-frame loop")
+    p.add_argument("--frames", type=int, default=64)
+    p.add_argument("--width", type=int, default=40)
+    p.add_argument("--height", type=int, default=22)
+    p.add_argument("--batches", type=int, nargs="+", default=[2, 4, 8, 16, 64])
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_render_many)
+
+    p = sub.add_parser("dither", help="per-frame cost of each dither mode")
+    p.add_argument("--frames", type=int, default=16)
+    p.add_argument("--width", type=int, default=120)
+    p.add_argument("--height", type=int, default=70)
+    p.add_argument("--charsets", nargs="+", default=["Block", "Newspaper", "Braille"])
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_dither)
+
+    p = sub.add_parser("import", help="worker import cost of the core vs the GUI module")
+    p.add_argument("--modules", nargs="+", default=["ascii_core", "ascii_camera"])
+    p.add_argument("--workers", type=int, default=4)
+    p.add_argument("--repeat", type=int, default=5)
+    p.set_defaults(func=bench_import)
+
+    p = sub.add_parser("alloc", help="per-frame allocations of the live path, pooled vs allocating")
+    p.add_argument("--frames", type=int, default=32)
+    p.add_argument("--warmup", type=int, default=4)
+    p.add_argument("--width", type=int, default=DEFAULTS['ascii_w'])
+    p.add_argument("--height", type=int, default=DEFAULTS['ascii_h'])
+    p.add_argument("--charset", default=DEFAULTS['char_set_name'], choices=list(CHAR_SETS))
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_alloc)
+
+    p = sub.add_parser("paint", help="QPainter export path: per-cell drawText vs monochrome text runs")
+    p.add_argument("--frames", type=int, default=8)
+    p.add_argument("--width", type=int, default=DEFAULTS['ascii_w'])
+    p.add_argument("--height", type=int, default=DEFAULTS['ascii_h'])
+    p.add_argument("--charsets", nargs="+", default=["LightSmooth", "Block", "Braille"])
+    p.set_defaults(func=bench_paint)
+
+    p = sub.add_parser("graph", help="several outputs from one frame: separate renders vs render graph")
+    p.add_argument("--frames", type=int, default=16)
+    p.add_argument("--outputs", nargs="+", metavar="NAME:CHARSET:WxH",
+                   default=["widget:Detailed:120x70", "record:Block:80x44",
+                            "preview:Detailed:80x44", "terminal:Braille:60x30"])
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_graph)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
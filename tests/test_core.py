@@ -0,0 +1,162 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ascii_core import (ASCIIRenderer, CHAR_SETS, DITHER_MODES, SUBCELLS, FrameHistory, MotionGate,
+                        RenderGraph, area_resize, color_classes, dither_quantize)
+
+
+@pytest.mark.parametrize("name", ["LightSmooth", "Block"])
+@pytest.mark.parametrize("alpha", [0.0, 0.5])
+def test_hysteresis_reaches_top_glyph(name, alpha):
+    renderer = ASCIIRenderer()
+    renderer.set_chars(CHAR_SETS[name])
+    renderer.set_temporal(alpha, 0.35)
+    img = np.full((20, 40, 3), 240, dtype=np.uint8)
+    for _ in range(3):
+        renderer.render(img, 40, 20)
+    img[:] = 255
+    for _ in range(40):
+        frame = renderer.render(img, 40, 20)
+    assert (frame.indices == renderer.n - 1).all()
+
+
+def test_hysteresis_holds_top_glyph():
+    renderer = ASCIIRenderer()
+    renderer.set_chars(CHAR_SETS["LightSmooth"])
+    renderer.set_temporal(0.0, 0.35)
+    img = np.full((4, 4, 3), 255, dtype=np.uint8)
+    renderer.render(img, 4, 4)
+    img[:] = 250
+    assert (renderer.render(img, 4, 4).indices == renderer.n - 1).all()
+
+
+def test_motion_gate_waits_for_ema_to_settle():
+    renderer = ASCIIRenderer()
+    renderer.set_chars(CHAR_SETS["Detailed"])
+    renderer.set_temporal(0.5, 0.35)
+    gate = MotionGate()
+    gate.enabled = True
+    shown = []
+    for i in range(20):
+        img = np.full((64, 64, 3), 30 if i < 5 else 220, dtype=np.uint8)
+        if gate.should_render(img, i * 0.04, renderer.settling):
+            shown.append(renderer.render(img, 16, 8).gray.mean())
+    step = 255 / (renderer.n - 1)
+    assert abs(shown[-1] - 220) <= step
+    assert not renderer.settling
+
+
+def test_subcell_modes_report_changes():
+    renderer = ASCIIRenderer()
+    renderer.set_chars(CHAR_SETS["HalfBlock"])
+    renderer.render(np.zeros((32, 32, 3), dtype=np.uint8), 16, 8)
+    renderer.render(np.full((32, 32, 3), 255, dtype=np.uint8), 16, 8)
+    assert renderer.change_raw == renderer.change_filtered == 1.0
+    renderer.render(np.full((32, 32, 3), 255, dtype=np.uint8), 16, 8)
+    assert renderer.change_raw == renderer.change_filtered == 0.0
+
+
+@pytest.mark.parametrize("levels", [8, 41, 64, 256])
+def test_color_classes_keep_white(levels):
+    renderer = ASCIIRenderer()
+    renderer.set_chars(CHAR_SETS["Block"])
+    frame = renderer.render(np.full((8, 8, 3), 255, dtype=np.uint8), 4, 2)
+    rgb = np.full((2, 4, 3), 255, dtype=np.uint8)
+    _, css = color_classes(frame, rgb, levels)
+    assert css == ["#ffffff"]
+
+
+def gradient(h, w, seed=0):
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:h, 0:w]
+    base = np.stack([xx * 255 // w, yy * 255 // h, (xx + yy) * 255 // (h + w)], -1)
+    return np.clip(base + rng.integers(-20, 21, base.shape), 0, 255).astype(np.uint8)
+
+
+@pytest.mark.parametrize("row, col, bit", [(0, 0, 0x01), (1, 0, 0x02), (2, 0, 0x04), (3, 0, 0x40),
+                                           (0, 1, 0x08), (1, 1, 0x10), (2, 1, 0x20), (3, 1, 0x80)])
+def test_braille_bit_order(row, col, bit):
+    renderer = ASCIIRenderer()
+    renderer.set_chars(CHAR_SETS["Braille"])
+    img = np.zeros((4, 2, 3), dtype=np.uint8)
+    img[row, col] = 255
+    assert renderer.render(img, 1, 1).text() == chr(0x2800 + bit)
+
+
+def test_halfblock_top_and_bottom_colours():
+    renderer = ASCIIRenderer()
+    renderer.set_chars(CHAR_SETS["HalfBlock"])
+    img = np.array([[[255, 200, 0]], [[0, 0, 255]]], dtype=np.uint8)
+    frame = renderer.render(img, 1, 1)
+    assert frame.text() == "▀"
+    assert frame.colors[0, 0].tolist() == [255, 200, 0]
+    assert frame.bg_colors[0, 0].tolist() == [0, 0, 255]
+
+
+def test_history_budget_counts_halfblock_bottoms():
+    renderer = ASCIIRenderer()
+    renderer.set_chars(CHAR_SETS["HalfBlock"])
+    frame = renderer.render(gradient(400, 400), 200, 100)
+    history = FrameHistory(max_frames=1000, max_mb=4)
+    history.append(frame)
+    buffers = (history._indices, history._colors, history._gray, history._bg_colors, history._bg_gray)
+    assert sum(b.nbytes for b in buffers) <= history.max_bytes
+    for _ in range(history.capacity + 2):
+        history.append(frame)
+    assert history._bg_colors is buffers[3]
+    assert (history.get(0).bg_colors == frame.bg_colors).all()
+
+
+@pytest.mark.parametrize("mode", DITHER_MODES)
+def test_dither_keeps_mean_level(mode):
+    level = np.full((32, 32), 2.3, dtype=np.float32)
+    out = dither_quantize(level, 7, mode)
+    assert out.min() >= 0 and out.max() <= 7
+    expected = 2.0 if mode == "none" else 2.3
+    assert abs(out.mean() - expected) < 0.1
+
+
+@pytest.mark.parametrize("name", ["Detailed", "Block", "HalfBlock", "Braille"])
+def test_render_many_matches_render(name):
+    renderer = ASCIIRenderer()
+    renderer.set_chars(CHAR_SETS[name])
+    frames = np.stack([gradient(120, 160, seed) for seed in range(3)])
+    indices, colors, gray = renderer.render_many(frames, 40, 22, 1.3)
+    sy, sx = SUBCELLS.get(renderer.mode, (1, 1))
+    for i, img in enumerate(frames):
+        small = (area_resize(img, 22 * sy, 40 * sx) + 0.5).astype(np.uint8)
+        frame = renderer.render(small, 40, 22, 1.3)
+        # render() считает яркость по округлённому до uint8 кадру — расхождения в пределах уровня
+        assert np.abs(frame.gray.astype(int) - gray[i]).max() <= 1
+        assert np.abs(frame.colors.astype(int) - colors[i]).max() <= 1
+        if name in ("Detailed", "Block"):
+            assert np.abs(frame.indices.astype(int) - indices[i]).max() <= 1
+        else:
+            assert np.mean(frame.indices != indices[i]) < 0.02
+
+
+def test_render_graph_matches_direct_render():
+    graph = RenderGraph()
+    graph.add_output("window", CHAR_SETS["Detailed"], 60, 35, contrast=1.3)
+    graph.add_output("record", CHAR_SETS["Block"], 40, 22, contrast=1.3)
+    graph.add_output("preview", CHAR_SETS["Detailed"], 40, 22, auto_contrast=True)
+    img = gradient(240, 320)
+    graph.submit(img)
+    outputs = graph.outputs()
+    assert outputs["record"].colors is outputs["preview"].colors
+    for name, chars, w, h, contrast, auto in (("window", "Detailed", 60, 35, 1.3, False),
+                                              ("record", "Block", 40, 22, 1.3, False),
+                                              ("preview", "Detailed", 40, 22, 1.0, True)):
+        renderer = ASCIIRenderer()
+        renderer.set_chars(CHAR_SETS[chars])
+        small = (area_resize(img, h, w) + 0.5).astype(np.uint8)
+        frame = renderer.render(small, w, h, contrast, auto)
+        assert (frame.colors == outputs[name].colors).all()
+        assert np.abs(frame.gray.astype(int) - outputs[name].gray).max() <= 1
+        assert np.abs(frame.indices.astype(int) - outputs[name].indices).max() <= 1
+    assert [stage for stage, _ in graph.report()][:2] == ["resize 60x35", "resize 40x22"]